@@ -4,8 +4,10 @@ Changelist alias utilities for git-p4son.
 Stores named aliases for changelist numbers in .git-p4son/changelists/<name>.
 """
 
+import functools
 import os
 import re
+from typing import Iterator
 
 from . import CONFIG_DIR
 from .log import log
@@ -49,6 +51,14 @@ def validate_alias_name(name: str) -> str | None:
     return None
 
 
+# Process-local cache of list_changelist_aliases results per store
+# directory, valid while the directory mtime is unchanged. Adding or
+# removing an alias file bumps the mtime; overwriting one in place does
+# not, so save and delete invalidate the entry explicitly.
+_aliases_cache: dict[str, tuple[int, list[tuple[str, str]]]] = {}
+
+
+@functools.lru_cache(maxsize=16)
 def _changelists_dir(workspace_dir: str) -> str:
     """Return the path to the changelists alias directory."""
     return os.path.join(workspace_dir, CONFIG_DIR, 'changelists')
@@ -72,6 +82,37 @@ def alias_exists(name: str, workspace_dir: str) -> bool:
     return os.path.exists(alias_path)
 
 
+def _write_alias_file(alias_path: str, content: str, force: bool) -> None:
+    """Write content to alias_path, raising FileExistsError unless force.
+
+    Without force the file is created with O_EXCL, so an existing alias
+    is detected by the create itself. With force the content goes to a
+    temporary file that is renamed over the alias, so a crash never
+    leaves a truncated alias behind. The temporary name starts with a
+    dot, which no valid alias name does, and is created like the alias
+    itself, so it gets the same umask-derived mode."""
+    if not force:
+        with open(alias_path, 'x') as f:
+            f.write(content)
+        return
+
+    directory, name = os.path.split(alias_path)
+    tmp_path = os.path.join(directory, f'.{name}.tmp')
+    try:
+        f = open(tmp_path, 'x')
+    except FileExistsError:
+        # Left behind by an interrupted forced save.
+        os.remove(tmp_path)
+        f = open(tmp_path, 'x')
+    try:
+        with f:
+            f.write(content)
+        os.replace(tmp_path, alias_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
 def save_changelist_alias(name: str, changelist: str, workspace_dir: str, force: bool = False) -> bool:
     """Save a changelist number under a named alias."""
     alias_path = _alias_path(name, workspace_dir)
@@ -79,18 +120,22 @@ def save_changelist_alias(name: str, changelist: str, workspace_dir: str, force:
         return False
 
     changelists_dir = _changelists_dir(workspace_dir)
-
-    if os.path.exists(alias_path) and not force:
+    content = changelist + '\n'
+
+    try:
+        try:
+            _write_alias_file(alias_path, content, force)
+        except FileNotFoundError:
+            # Only create the store directory once a write shows it is
+            # missing, instead of probing for it on every save.
+            log.info(f'Creating {changelists_dir}')
+            os.makedirs(changelists_dir, exist_ok=True)
+            _write_alias_file(alias_path, content, force)
+    except FileExistsError:
         log.error(
             f'Alias "{name}" already exists (use -f/--force to overwrite)')
         return False
-
-    if not os.path.isdir(changelists_dir):
-        log.info(f'Creating {changelists_dir}')
-        os.makedirs(changelists_dir, exist_ok=True)
-
-    with open(alias_path, 'w') as f:
-        f.write(changelist + '\n')
+    _aliases_cache.pop(changelists_dir, None)
 
     return True
 
@@ -101,13 +146,15 @@ def load_changelist_alias(name: str, workspace_dir: str) -> str | None:
     if alias_path is None:
         return None
 
-    if not os.path.exists(alias_path):
+    # Open directly rather than checking exists() first: one syscall
+    # fewer, and no window for the file to vanish between the two.
+    try:
+        with open(alias_path, 'r') as f:
+            content = f.read().strip()
+    except FileNotFoundError:
         log.error(f'No changelist alias found: {name}')
         return None
 
-    with open(alias_path, 'r') as f:
-        content = f.read().strip()
-
     if not content:
         log.error(f'Changelist alias "{name}" is empty')
         return None
@@ -115,23 +162,42 @@ def load_changelist_alias(name: str, workspace_dir: str) -> str | None:
     return content
 
 
+def _scan_aliases(changelists_dir: str) -> Iterator[tuple[str, str]]:
+    """Yield (name, changelist) for each non-empty alias file."""
+    # scandir reports the entry type from the directory listing itself on
+    # most platforms, so telling files apart needs no stat per alias.
+    with os.scandir(changelists_dir) as entries:
+        for entry in entries:
+            # Dot files are never aliases, e.g. a leftover temporary file
+            # from an interrupted save.
+            if entry.name.startswith('.') or not entry.is_file():
+                continue
+            try:
+                with open(entry.path, 'r') as f:
+                    content = f.read().strip()
+            except FileNotFoundError:
+                continue  # deleted since the directory was listed
+            if content:
+                yield (entry.name, content)
+
+
 def list_changelist_aliases(workspace_dir: str) -> list[tuple[str, str]]:
     """Return all changelist aliases as sorted (name, changelist) tuples."""
     changelists_dir = _changelists_dir(workspace_dir)
 
-    if not os.path.isdir(changelists_dir):
+    try:
+        mtime = os.stat(changelists_dir).st_mtime_ns
+    except FileNotFoundError:
         return []
 
-    aliases = []
-    for name in os.listdir(changelists_dir):
-        alias_path = os.path.join(changelists_dir, name)
-        if os.path.isfile(alias_path):
-            with open(alias_path, 'r') as f:
-                content = f.read().strip()
-            if content:
-                aliases.append((name, content))
+    cached = _aliases_cache.get(changelists_dir)
+    if cached is not None and cached[0] == mtime:
+        return list(cached[1])
 
-    return sorted(aliases, key=lambda x: x[0])
+    # Names are unique, so plain tuple order sorts by name.
+    aliases = sorted(_scan_aliases(changelists_dir))
+    _aliases_cache[changelists_dir] = (mtime, aliases)
+    return list(aliases)
 
 
 def delete_changelist_alias(name: str, workspace_dir: str) -> bool:
@@ -140,9 +206,10 @@ def delete_changelist_alias(name: str, workspace_dir: str) -> bool:
     if alias_path is None:
         return False
 
-    if not os.path.exists(alias_path):
+    try:
+        os.remove(alias_path)
+    except FileNotFoundError:
         log.error(f'No changelist alias found: {name}')
         return False
-
-    os.remove(alias_path)
+    _aliases_cache.pop(_changelists_dir(workspace_dir), None)
     return True
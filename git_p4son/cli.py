@@ -3,68 +3,18 @@ Main CLI entry point for git-p4son.
 """
 
 import argparse
+import functools
+import importlib
 import os
 import sys
-import time
-from importlib.resources import files
 from . import __version__
-from .sync import sync_command
-from .new import new_command
-from .update import update_command
-from .list_changes import list_changes_command
-from .alias import alias_command
-from .init import init_command
-from .review import review_command, sequence_editor_command
-from .changelist_store import RESERVED_KEYWORDS
 from .common import CommandError, RunError, branch_to_alias
 from .git import get_current_branch, get_head_subject, get_workspace_dir
 from .log import log
-from .complete import run_complete
 
 
-def create_parser() -> argparse.ArgumentParser:
-    """Create the main argument parser."""
-    parser = argparse.ArgumentParser(
-        prog='git-p4son',
-        description='Utility for keeping a Perforce workspace and local git repo in sync',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  git-p4son sync                # Sync to the latest changelist
-  git-p4son sync head           # Sync to the latest changelist (explicit)
-  git-p4son sync 12345          # Sync to changelist 12345
-  git-p4son sync 123 156 178    # Sync each changelist in sequence, one commit each
-  git-p4son sync 123 156 head   # Sync 123, 156, then the latest changelist
-  git-p4son sync last-synced    # Re-sync the last synced changelist
-  git-p4son new -m "Fix bug"    # Create changelist, alias defaults to branch name
-  git-p4son new -m "Fix bug" --review  # Create changelist, create Swarm review
-  git-p4son new -m "Fix bug" --no-alias # Create changelist without saving an alias
-  git-p4son update --shelve     # Update changelist for current branch and re-shelve
-  git-p4son update 12345        # Update changelist 12345
-  git-p4son list-changes --base-branch main # List commit subjects since main branch
-        """
-    )
-
-    parser.add_argument(
-        '--version',
-        action='version',
-        version=f'git-p4son {__version__}'
-    )
-
-    parser.add_argument(
-        '-v', '--verbose',
-        action='store_true',
-        default=False,
-        help='Show verbose output (commands, elapsed times, raw subprocess output)'
-    )
-
-    subparsers = parser.add_subparsers(
-        dest='command',
-        help='Available commands',
-        metavar='COMMAND'
-    )
-
-    # Init subcommand
+def _add_init_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Register the init subcommand."""
     subparsers.add_parser(
         'init',
         help='Initialize a git repository inside a Perforce workspace',
@@ -73,7 +23,9 @@ Examples:
         'sets up .gitignore, and creates an initial commit.'
     )
 
-    # Sync subcommand
+
+def _add_sync_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Register the sync subcommand."""
     sync_parser = subparsers.add_parser(
         'sync',
         help='Sync local git repository with a Perforce workspace',
@@ -96,7 +48,9 @@ Examples:
         help='Allow syncing to changelists older than the current one.'
     )
 
-    # New subcommand
+
+def _add_new_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Register the new subcommand."""
     new_parser = subparsers.add_parser(
         'new',
         help='Create a new changelist, open files for edit, and optionally create a Swarm review',
@@ -157,7 +111,9 @@ Examples:
         help='Sleep for the specified number of seconds after the command is done'
     )
 
-    # Update subcommand
+
+def _add_update_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Register the update subcommand."""
     update_parser = subparsers.add_parser(
         'update',
         help='Update an existing changelist description and open files for edit',
@@ -205,7 +161,9 @@ Examples:
         help='Sleep for the specified number of seconds after the command is done'
     )
 
-    # List-changes subcommand
+
+def _add_list_changes_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Register the list-changes subcommand."""
     list_changes_parser = subparsers.add_parser(
         'list-changes',
         help='List commit subjects since base branch',
@@ -217,7 +175,9 @@ Examples:
         help='Base branch to compare against. Default is HEAD~1'
     )
 
-    # Alias subcommand
+
+def _add_alias_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Register the alias subcommand."""
     alias_parser = subparsers.add_parser(
         'alias',
         help='Manage changelist aliases',
@@ -281,7 +241,9 @@ Examples:
         'or review each one interactively with yes/no/all/quit prompts'
     )
 
-    # Review subcommand
+
+def _add_review_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Register the review subcommand."""
     review_parser = subparsers.add_parser(
         'review',
         help='Create a Swarm review via automated interactive rebase',
@@ -316,7 +278,9 @@ Examples:
         help='Print the generated rebase todo without executing'
     )
 
-    # Completion subcommand (prints shell completion script path)
+
+def _add_completion_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Register the completion subcommand."""
     completion_parser = subparsers.add_parser(
         'completion',
         help='Print path to a shell completion script',
@@ -334,7 +298,9 @@ Examples:
         help='Print the directory instead of the full file path'
     )
 
-    # Hidden _sequence-editor subcommand (used internally by review)
+
+def _add_sequence_editor_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Register the _sequence-editor subcommand."""
     seq_editor_parser = subparsers.add_parser(
         '_sequence-editor',
         help=argparse.SUPPRESS,
@@ -344,6 +310,88 @@ Examples:
         help='The rebase todo file to edit'
     )
 
+
+# Subcommand name -> function registering its parser, in help order.
+_SUBPARSER_BUILDERS = {
+    'init': _add_init_parser,
+    'sync': _add_sync_parser,
+    'new': _add_new_parser,
+    'update': _add_update_parser,
+    'list-changes': _add_list_changes_parser,
+    'alias': _add_alias_parser,
+    'review': _add_review_parser,
+    'completion': _add_completion_parser,
+    '_sequence-editor': _add_sequence_editor_parser,
+}
+
+
+# Examples shown at the end of the top-level help.
+_EPILOG = """
+Examples:
+  git-p4son sync                # Sync to the latest changelist
+  git-p4son sync head           # Sync to the latest changelist (explicit)
+  git-p4son sync 12345          # Sync to changelist 12345
+  git-p4son sync 123 156 178    # Sync each changelist in sequence, one commit each
+  git-p4son sync 123 156 head   # Sync 123, 156, then the latest changelist
+  git-p4son sync last-synced    # Re-sync the last synced changelist
+  git-p4son new -m "Fix bug"    # Create changelist, alias defaults to branch name
+  git-p4son new -m "Fix bug" --review  # Create changelist, create Swarm review
+  git-p4son new -m "Fix bug" --no-alias # Create changelist without saving an alias
+  git-p4son update --shelve     # Update changelist for current branch and re-shelve
+  git-p4son update 12345        # Update changelist 12345
+  git-p4son list-changes --base-branch main # List commit subjects since main branch
+"""
+
+
+def create_parser(command: str | None = None) -> argparse.ArgumentParser:
+    """Create the main argument parser.
+
+    With a known command name only that subcommand is registered, which
+    is all that parsing its arguments needs. Otherwise, e.g. for top-level
+    help or an unknown command, every subcommand is registered.
+
+    Parsers are built once per process and shared; parse_args does not
+    modify them, so callers must not either."""
+    if command not in _SUBPARSER_BUILDERS:
+        command = None
+    return _build_parser(command)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser(command: str | None) -> argparse.ArgumentParser:
+    """Build the parser for create_parser, memoized per command."""
+    parser = argparse.ArgumentParser(
+        prog='git-p4son',
+        description='Utility for keeping a Perforce workspace and local git repo in sync',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG
+    )
+
+    parser.add_argument(
+        '--version',
+        action='version',
+        version=f'git-p4son {__version__}'
+    )
+
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        default=False,
+        help='Show verbose output (commands, elapsed times, raw subprocess output)'
+    )
+
+    subparsers = parser.add_subparsers(
+        dest='command',
+        help='Available commands',
+        metavar='COMMAND'
+    )
+
+    if command in _SUBPARSER_BUILDERS:
+        _SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for add_parser in _SUBPARSER_BUILDERS.values():
+            add_parser(subparsers)
+
     return parser
 
 
@@ -353,6 +401,8 @@ def _resolve_branch_keyword(workspace_dir: str) -> str | None:
     Returns the resolved alias name, or None if resolution fails.
     Prints an error message on failure.
     """
+    from .changelist_store import RESERVED_KEYWORDS
+
     branch = get_current_branch(workspace_dir)
     if not branch:
         log.error(
@@ -375,6 +425,8 @@ _COMPLETION_FILES = {
 
 def completion_command(args: argparse.Namespace) -> int:
     """Print path to a shell completion script."""
+    from importlib.resources import files
+
     filename = _COMPLETION_FILES[args.shell]
     completions_dir = files('git_p4son') / 'completions'
 
@@ -386,6 +438,19 @@ def completion_command(args: argparse.Namespace) -> int:
     return 0
 
 
+# Workspace command name -> (module, function) handling it. Modules are
+# imported on dispatch, so each invocation only loads the one it runs.
+_COMMAND_HANDLERS = {
+    'sync': ('.sync', 'sync_command'),
+    'new': ('.new', 'new_command'),
+    'update': ('.update', 'update_command'),
+    'list-changes': ('.list_changes', 'list_changes_command'),
+    'alias': ('.alias', 'alias_command'),
+    'review': ('.review', 'review_command'),
+    '_sequence-editor': ('.review', 'sequence_editor_command'),
+}
+
+
 def run_command(args: argparse.Namespace) -> int:
     args.invocation_dir = os.getcwd()
 
@@ -427,23 +492,13 @@ def run_command(args: argparse.Namespace) -> int:
             return 1
         log.success(args.message)
 
-    if args.command == 'sync':
-        return sync_command(args)
-    elif args.command == 'new':
-        return new_command(args)
-    elif args.command == 'update':
-        return update_command(args)
-    elif args.command == 'list-changes':
-        return list_changes_command(args)
-    elif args.command == 'alias':
-        return alias_command(args)
-    elif args.command == 'review':
-        return review_command(args)
-    elif args.command == '_sequence-editor':
-        return sequence_editor_command(args)
-    else:
+    handler = _COMMAND_HANDLERS.get(args.command)
+    if handler is None:
         log.error(f'Unknown command: {args.command}')
         return 1
+    module_name, function_name = handler
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, function_name)(args)
 
 
 def main() -> int:
@@ -454,9 +509,15 @@ def main() -> int:
         # Strip leading '--' separator if present
         if words and words[0] == '--':
             words = words[1:]
+        from .complete import run_complete
         return run_complete(words)
 
-    parser = create_parser()
+    # Answer a bare --version without building the full parser.
+    if sys.argv[1:] == ['--version']:
+        print(f'git-p4son {__version__}')
+        return 0
+
+    parser = create_parser(sys.argv[1] if len(sys.argv) >= 2 else None)
     args = parser.parse_args()
 
     if not args.command:
@@ -471,11 +532,13 @@ def main() -> int:
 
         # Run init before run_command (as no workspace needed)
         if args.command == 'init':
+            from .init import init_command
             return init_command(args)
 
         exit_code = run_command(args)
 
         if exit_code == 0 and getattr(args, 'sleep', None) is not None:
+            import time
             seconds = args.sleep
             log.heading(f'Sleeping for {seconds} seconds')
             time.sleep(seconds)
@@ -10,7 +10,6 @@ import re
 import subprocess
 import sys
 import threading
-import time
 from timeit import default_timer as timer
 from datetime import timedelta
 from typing import IO, Callable
@@ -61,9 +60,13 @@ def prompt_choice(prefix: str, options: list[str]) -> str | None:
             print('Please enter ' + ', '.join(keys[:-1]) + f' or {keys[-1]}')
 
 
+# Windows drive prefix, e.g. "C:".
+_DRIVE_RE = re.compile(r'^[A-Za-z]:')
+
+
 def _path_module_for(*paths: str):
     """Choose a path module that matches the given path strings."""
-    if any('\\' in path or re.match(r'^[A-Za-z]:', path) for path in paths):
+    if any('\\' in path or _DRIVE_RE.match(path) for path in paths):
         return ntpath
     return posixpath
 
@@ -115,26 +118,39 @@ class RunError(CommandError):
 
 
 class RunResult:
-    """Result of a command execution."""
+    """Result of a command execution.
+
+    Text output may be passed as an unsplit string; it is split into
+    lines on first access, so callers that only check the return code
+    never pay for splitting large output."""
 
     def __init__(self, returncode: int,
-                 stdout: list[str] | bytes,
-                 stderr: list[str] | bytes,
+                 stdout: list[str] | str | bytes,
+                 stderr: list[str] | str | bytes,
                  elapsed: timedelta | None = None) -> None:
         self.returncode: int = returncode
-        self.stdout: list[str] | bytes = stdout
-        self.stderr: list[str] | bytes = stderr
+        self._stdout: list[str] | str | bytes = stdout
+        self._stderr: list[str] | str | bytes = stderr
         self.elapsed: timedelta | None = elapsed
 
+    @property
+    def stdout(self) -> list[str] | bytes:
+        """Output lines, or raw bytes for commands run with text=False."""
+        if isinstance(self._stdout, str):
+            self._stdout = self._stdout.splitlines()
+        return self._stdout
+
+    @property
+    def stderr(self) -> list[str] | bytes:
+        """Error lines, or raw bytes for commands run with text=False."""
+        if isinstance(self._stderr, str):
+            self._stderr = self._stderr.splitlines()
+        return self._stderr
+
 
 def join_command_line(command: list[str]) -> str:
-    command_line = ''
-    for c in command:
-        if ' ' in c:
-            command_line += f' "{c}"'
-        else:
-            command_line += f' {c}'
-    return command_line
+    """Render a command for display, double-quoting arguments with spaces."""
+    return ''.join(f' "{c}"' if ' ' in c else f' {c}' for c in command)
 
 
 def run(command: list[str], cwd: str = '.', dry_run: bool = False,
@@ -212,17 +228,18 @@ def run(command: list[str], cwd: str = '.', dry_run: bool = False,
             stderr=stderr,
         )
 
-    if text:
-        return RunResult(result.returncode, result.stdout.splitlines(),
-                         result.stderr.splitlines(), elapsed=elapsed)
+    # Text output is split into lines lazily by RunResult.
     return RunResult(result.returncode, result.stdout,
                      result.stderr, elapsed=elapsed)
 
 
-def enqueue_lines(stream: IO[str], output_queue: queue.Queue[str]) -> None:
-    """Enqueue lines from a stream into a queue."""
+def enqueue_lines(stream: IO[str],
+                  output_queue: queue.SimpleQueue[tuple[str, str | None]],
+                  tag: str) -> None:
+    """Enqueue (tag, line) pairs from a stream, then (tag, None) at EOF."""
     for line in iter(stream.readline, ''):
-        output_queue.put(line.rstrip())
+        output_queue.put((tag, line.rstrip()))
+    output_queue.put((tag, None))
 
 
 def run_with_output(command: list[str], cwd: str = '.',
@@ -274,46 +291,46 @@ def run_with_output(command: list[str], cwd: str = '.',
 
     with process_cm as process:
 
-        output_queue: queue.Queue[str] = queue.Queue()
-        out_thread = threading.Thread(
-            target=enqueue_lines, args=(process.stdout, output_queue))
-        out_thread.daemon = True
-
-        error_queue: queue.Queue[str] = queue.Queue()
-        err_thread = threading.Thread(
-            target=enqueue_lines, args=(process.stderr, error_queue))
-        err_thread.daemon = True
-
-        out_thread.start()
-        err_thread.start()
-
-        def drain_queue(q, lines, stream):
-            try:
-                while not q.empty():
-                    line = q.get_nowait()
-                    lines.append(line)
-                    if on_output:
-                        on_output(line=line, stream=stream)
-            except queue.Empty:
-                pass
+        # Both readers feed one queue, so the loop below can block on it
+        # instead of polling two queues on a timer.
+        output_queue: queue.SimpleQueue[tuple[str, str | None]] = (
+            queue.SimpleQueue())
+        readers = [
+            threading.Thread(target=enqueue_lines,
+                             args=(process.stdout, output_queue, 'stdout'),
+                             daemon=True),
+            threading.Thread(target=enqueue_lines,
+                             args=(process.stderr, output_queue, 'stderr'),
+                             daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        lines_by_tag = {'stdout': stdout_lines, 'stderr': stderr_lines}
 
         try:
-            # The reader threads own the pipes and exit at EOF, so they are
-            # the source of truth for "no more output is coming". Looping on
-            # process.poll() instead would race: the process can exit while
-            # lines are still in the pipe buffer, and anything enqueued after
-            # the last drain would be lost.
-            while out_thread.is_alive() or err_thread.is_alive():
-                drain_queue(output_queue, stdout_lines, sys.stdout)
-                drain_queue(error_queue, stderr_lines, sys.stderr)
-                time.sleep(0.05)
-
-            out_thread.join()
-            err_thread.join()
-
-            # Final drain for lines enqueued after the last pass above.
-            drain_queue(output_queue, stdout_lines, sys.stdout)
-            drain_queue(error_queue, stderr_lines, sys.stderr)
+            # The reader threads own the pipes and enqueue a None line at
+            # EOF, so they are the source of truth for "no more output is
+            # coming". Looping on process.poll() instead would race: the
+            # process can exit while lines are still in the pipe buffer.
+            open_streams = len(readers)
+            while open_streams:
+                try:
+                    tag, line = output_queue.get(timeout=0.5)
+                except queue.Empty:
+                    # Only time out so Ctrl-C is seen on Windows, where a
+                    # blocking wait cannot be interrupted.
+                    continue
+                if line is None:
+                    open_streams -= 1
+                    continue
+                lines_by_tag[tag].append(line)
+                if on_output:
+                    stream = sys.stdout if tag == 'stdout' else sys.stderr
+                    on_output(line=line, stream=stream)
+
+            for reader in readers:
+                reader.join()
 
             returncode = process.wait()
 
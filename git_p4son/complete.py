@@ -7,6 +7,8 @@ Special directives (e.g. __branch__) tell the shell wrapper to use native comple
 """
 
 import argparse
+import functools
+import sys
 
 from .changelist_store import list_changelist_aliases
 from .common import branch_to_alias
@@ -36,10 +38,16 @@ def _flag_takes_value(action):
     ))
 
 
-def _get_flags(parser):
-    """Get all optional flags from a parser as (flag, help) pairs."""
+# Parsers are built once per process (see cli.create_parser), so their
+# flag tables can be indexed once and reused for every word completed.
+@functools.lru_cache(maxsize=32)
+def _flag_index(parser):
+    """Return ({flag: action}, [(flag, help)]) for a parser's options."""
+    actions = {}
     flags = []
     for action in parser._actions:
+        for opt in action.option_strings:
+            actions[opt] = action
         if not action.option_strings:
             continue
         if isinstance(action, argparse._HelpAction):
@@ -49,15 +57,25 @@ def _get_flags(parser):
             continue
         for opt in action.option_strings:
             flags.append((opt, help_text))
-    return flags
+    return actions, flags
+
+
+@functools.lru_cache(maxsize=32)
+def _visible_commands(subparsers_action):
+    """Return (command, help) pairs for the commands offered to the user."""
+    return [(ca.dest, ca.help or '')
+            for ca in getattr(subparsers_action, '_choices_actions', [])
+            if ca.dest not in _HIDDEN_COMMANDS]
+
+
+def _get_flags(parser):
+    """Get all optional flags from a parser as (flag, help) pairs."""
+    return list(_flag_index(parser)[1])
 
 
 def _find_flag_action(parser, flag):
     """Find the action for a given flag string."""
-    for action in parser._actions:
-        if flag in action.option_strings:
-            return action
-    return None
+    return _flag_index(parser)[0].get(flag)
 
 
 def _get_alias_names(workspace_dir):
@@ -101,11 +119,15 @@ def _get_branch_candidates(prefix, workspace_dir):
     return []
 
 
+def _branch_and_alias_candidates(prefix, workspace_dir):
+    """Get 'branch' and alias name candidates for an alias argument."""
+    return (_get_branch_candidates(prefix, workspace_dir)
+            + _filter(_get_alias_names(workspace_dir), prefix))
+
+
 def _complete_positional(command, subcommand, positional_count,
                          prefix, workspace_dir, command_parser):
     """Complete a positional argument."""
-    aliases = _get_alias_names(workspace_dir)
-
     if command == 'sync':
         if positional_count == 0:
             candidates = [
@@ -118,8 +140,7 @@ def _complete_positional(command, subcommand, positional_count,
             [('head', 'Sync to the latest changelist')], prefix)
 
     if command == 'update' and positional_count == 0:
-        branch_candidates = _get_branch_candidates(prefix, workspace_dir)
-        return branch_candidates + _filter(aliases, prefix)
+        return _branch_and_alias_candidates(prefix, workspace_dir)
 
     if command == 'alias':
         if subcommand is None and positional_count == 0:
@@ -131,16 +152,13 @@ def _complete_positional(command, subcommand, positional_count,
             return []
 
         if subcommand == 'delete' and positional_count == 0:
-            branch_candidates = _get_branch_candidates(prefix, workspace_dir)
-            return branch_candidates + _filter(aliases, prefix)
+            return _branch_and_alias_candidates(prefix, workspace_dir)
 
         if subcommand == 'new' and positional_count == 1:
-            branch_candidates = _get_branch_candidates(prefix, workspace_dir)
-            return branch_candidates + _filter(aliases, prefix)
+            return _branch_and_alias_candidates(prefix, workspace_dir)
 
     if command in ('new', 'review') and positional_count == 0:
-        branch_candidates = _get_branch_candidates(prefix, workspace_dir)
-        return branch_candidates + _filter(aliases, prefix)
+        return _branch_and_alias_candidates(prefix, workspace_dir)
 
     return []
 
@@ -208,11 +226,7 @@ def _complete(parser, words, workspace_dir=None):
         if prefix.startswith('-'):
             return _filter(_get_flags(parser), prefix)
         else:
-            candidates = []
-            for ca in getattr(subparsers_action, '_choices_actions', []):
-                if ca.dest not in _HIDDEN_COMMANDS:
-                    candidates.append((ca.dest, ca.help or ''))
-            return _filter(candidates, prefix)
+            return _filter(_visible_commands(subparsers_action), prefix)
 
     # Completing a flag for the current command
     if prefix.startswith('-'):
@@ -233,9 +247,9 @@ def run_complete(words):
     parser = create_parser()
     workspace_dir = get_workspace_dir()
     candidates = _complete(parser, words, workspace_dir)
-    for name, description in candidates:
-        if description:
-            print(f'{name}\t{description}')
-        else:
-            print(name)
+    # One write for all candidates rather than a print per line.
+    output = ''.join(
+        f'{name}\t{description}\n' if description else f'{name}\n'
+        for name, description in candidates)
+    sys.stdout.write(output)
     return 0
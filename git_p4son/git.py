@@ -5,7 +5,6 @@ All functions that interact directly with the git CLI live here.
 
 import os
 import os.path
-import re
 
 from .common import (
     CommandError,
@@ -153,51 +152,47 @@ class LocalChanges:
         self.moves: list[tuple[str, str]] = []
 
 
-def find_common_ancestor(branch1: str, branch2: str, workspace_dir: str) -> str:
-    """Find the common ancestor commit between two branches."""
-    res = run(['git', 'merge-base', branch1, branch2], cwd=workspace_dir)
-    if not res.stdout or len(res.stdout) != 1:
-        raise CommandError('git merge-base returned unexpected output')
-    return res.stdout[0].strip()
-
-
 def get_local_changes(base_branch: str, workspace_dir: str) -> LocalChanges:
-    """Get local git changes between base_branch and HEAD."""
-    ancestor = find_common_ancestor(base_branch, 'HEAD', workspace_dir)
-
-    # quotepath off: non-ASCII filenames are emitted verbatim instead of
-    # C-quoted octal escapes ("b\303\244ck.txt") that would never match a
-    # file on disk or in p4.
-    res = run(['git', '-c', 'core.quotepath=off', 'diff', '--name-status',
-               f'{ancestor}..HEAD'],
-              cwd=workspace_dir)
-
+    """Get local git changes between base_branch and HEAD.
+
+    The three-dot range diffs HEAD against its merge base with
+    base_branch, so git resolves the common ancestor itself instead of
+    needing a separate merge-base call first."""
+    # -z output is NUL-separated and verbatim: non-ASCII filenames are
+    # not C-quoted ("b\303\244ck.txt"), and tabs or newlines in names
+    # cannot be mistaken for separators.
+    res = run(['git', 'diff', '-z', '--name-status', f'{base_branch}...HEAD'],
+              cwd=workspace_dir, text=False)
+
+    # Entries are "<status>\0<path>\0", or "<status>\0<from>\0<to>\0"
+    # for renames and copies; the output ends with a NUL.
+    tokens = [os.fsdecode(token) for token in res.stdout.split(b'\0')[:-1]]
     changes = LocalChanges()
-    renamepattern = r"^r(\d+)$"
-    copypattern = r"^c(\d+)$"
-    for line in res.stdout:
-        tokens = line.split('\t')
-        status = tokens[0].lower()
-        filename = tokens[1]
-        if status == 'm':
-            changes.mods.append(filename)
-        elif status == 't':
-            # Typechange (e.g. symlink to regular file): content changed.
+    i = 0
+    while i < len(tokens):
+        status = tokens[i]
+        kind = status[:1]
+        if kind in ('R', 'C') and i + 2 < len(tokens):
+            from_filename, to_filename = tokens[i + 1], tokens[i + 2]
+            i += 3
+            if kind == 'R':
+                changes.moves.append((from_filename, to_filename))
+            else:
+                # Copy (with diff.renames=copies): the source is untouched,
+                # only the destination is a new file.
+                changes.adds.append(to_filename)
+            continue
+        if kind not in ('M', 'T', 'D', 'A') or i + 1 >= len(tokens):
+            raise CommandError(f'Unknown git status "{status}"')
+        filename = tokens[i + 1]
+        i += 2
+        if kind in ('M', 'T'):
+            # T is a typechange (e.g. symlink to regular file): content changed.
             changes.mods.append(filename)
-        elif status == 'd':
+        elif kind == 'D':
             changes.dels.append(filename)
-        elif status == 'a':
-            changes.adds.append(filename)
-        elif re.search(renamepattern, status):
-            from_filename = filename
-            to_filename = tokens[2]
-            changes.moves.append((from_filename, to_filename))
-        elif re.search(copypattern, status):
-            # Copy (with diff.renames=copies): the source is untouched,
-            # only the destination is a new file.
-            changes.adds.append(tokens[2])
         else:
-            raise CommandError(f'Unknown git status in "{line}"')
+            changes.adds.append(filename)
 
     return changes
 
@@ -220,18 +215,14 @@ def get_commit_lines_since(base_branch: str, workspace_dir: str) -> list[str]:
 
 
 def get_commit_subjects_since(base_branch: str, workspace_dir: str) -> list[str]:
-    """Get commit subjects from git log since base branch."""
-    lines = get_commit_lines_since(base_branch, workspace_dir)
-
-    subjects = []
-    for line in lines:
-        if ' ' in line:
-            subject = line.split(' ', 1)[1]
-            subjects.append(subject)
-        else:
-            subjects.append(line)
+    """Get commit subjects from git log since base branch.
 
-    return subjects
+    Same commits as get_commit_lines_since, but git emits only the
+    subjects, so no hash needs to be split off each line."""
+    res = run(['git', 'log', '--format=%s', '--no-decorate',
+               '--reverse', '--no-merges',
+               f'{base_branch}..HEAD'], cwd=workspace_dir)
+    return res.stdout
 
 
 # --- tracking ---
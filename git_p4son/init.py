@@ -139,7 +139,7 @@ def _setup_gitignore(cwd: str) -> str:
         return '.gitignore already exist'
 
     if os.path.exists(p4ignore_path):
-        shutil.copy2(p4ignore_path, gitignore_path)
+        shutil.copyfile(p4ignore_path, gitignore_path)
         return 'copied .p4ignore to new .gitignore'
 
     with open(gitignore_path, 'w') as f:
@@ -20,6 +20,12 @@ from .perforce import (
 # Heading written above the enumerated commit list in descriptions.
 COMMIT_LIST_MARKER = 'Changes included:'
 
+# Number prefix of an enumerated commit line, e.g. "3. " in "3. Fix bug".
+_COMMIT_LINE_RE = re.compile(r'^\d+\. ')
+
+# p4 change -i output for a new changelist, e.g. "Change 12345 created."
+_CHANGE_CREATED_RE = re.compile(r'Change (\d+) created')
+
 
 def split_description_lines(lines: list[str]) -> tuple[list[str], list[str], list[str]]:
     """Split description into (message_lines, commit_lines, trailing_lines).
@@ -54,11 +60,11 @@ def split_description_lines(lines: list[str]) -> tuple[list[str], list[str], lis
     end = start + 1
     expected_nr = 2
     for j in range(end, len(lines)):
-        if lines[j].startswith(f'{expected_nr}. '):
-            expected_nr += 1
-            end = j + 1
-        else:
+        head, sep, _ = lines[j].partition('. ')
+        if not (sep and head == str(expected_nr)):
             break
+        expected_nr += 1
+        end = j + 1
 
     return (lines[:start], lines[start:end], lines[end:])
 
@@ -81,20 +87,18 @@ def create_changelist(message: str, base_branch: str, workspace_dir: str, dry_ru
         log.info('\n'.join(description_lines))
         return '<changelist>'
 
-    # Prepare the changelist spec content
-    tabbed_description = "\n\t".join(description_lines)
-    spec_content = f"Change: new\n\nDescription:\n\t{tabbed_description}\n"
+    # Prepare the changelist spec content, tab-indenting each line in a
+    # single join rather than joining and then re-splitting the text.
+    spec_content = 'Change: new\n\nDescription:\n' + ''.join(
+        f'\t{line}\n' for line in description_lines)
 
     # Create the changelist using p4 change -i
     result = run(['p4', 'change', '-i'], cwd=workspace_dir, input=spec_content)
 
     # Extract changelist number from output
-    # Format: "Change 12345 created."
-    for line in result.stdout:
-        if 'Change' in line and 'created' in line:
-            match = re.search(r'Change (\d+) created', line)
-            if match:
-                return match.group(1)
+    match = _CHANGE_CREATED_RE.search('\n'.join(result.stdout))
+    if match:
+        return match.group(1)
 
     raise CommandError(
         'Failed to extract changelist number from p4 change output',
@@ -117,7 +121,7 @@ def update_changelist(changelist_nr: str, base_branch: str, workspace_dir: str,
     message_lines, old_commit_lines, trailing_lines = split_description_lines(
         description_lines)
 
-    old_subjects = [re.sub(r'^\d+\. ', '', line)
+    old_subjects = [_COMMIT_LINE_RE.sub('', line, count=1)
                     for line in old_commit_lines]
     new_subjects = get_commit_subjects_since(base_branch, workspace_dir)
 
@@ -143,6 +147,12 @@ def update_changelist(changelist_nr: str, base_branch: str, workspace_dir: str,
     # Rebuild description: message + commit list + trailing
     new_description_lines = message_lines + commit_lines + trailing_lines
 
+    # Skip the p4 change -i round trip when there is nothing to write,
+    # e.g. when re-running update on an already up-to-date changelist.
+    if new_description_lines == description_lines:
+        log.info(f'Changelist {changelist_nr} description is up to date')
+        return
+
     if dry_run:
         log.info(f"Would update changelist {changelist_nr} with description:")
         log.info('\n'.join(new_description_lines))
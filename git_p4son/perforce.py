@@ -3,6 +3,7 @@
 All functions that interact directly with the p4 CLI live here.
 """
 
+import os
 import re
 import sys
 from dataclasses import dataclass
@@ -11,6 +12,8 @@ from typing import IO
 from .common import (
     CommandError,
     RunError,
+    RunResult,
+    join_command_line,
     normalize_workspace_path,
     run,
     run_with_output,
@@ -107,20 +110,12 @@ def get_client_spec(cwd: str) -> P4ClientSpec | None:
 
 # --- changelist spec parsing ---
 
-def find_line_starting_with(lines: list[str], prefix: str) -> int:
-    """Find the index of the first line starting with prefix, or len(lines) if not found."""
-    for i, line in enumerate(lines):
-        if line.startswith(prefix):
-            return i
-    return len(lines)
+# The Description: header line; group 1 is the tab-indented block below it.
+_DESCRIPTION_RE = re.compile(
+    r'^Description:.*\n((?:\t.*(?:\n|\Z))*)', re.MULTILINE)
 
-
-def find_end_of_indented_section(lines: list[str], start: int) -> int:
-    """Find the end of a tab-indented section starting at the given index."""
-    i = start
-    while i < len(lines) and lines[i].startswith('\t'):
-        i += 1
-    return i
+# One line of a description block; group 1 is the text after the tab.
+_DESCRIPTION_LINE_RE = re.compile(r'\t(.*)\n?')
 
 
 def extract_description_lines(spec_text: str) -> list[str]:
@@ -132,27 +127,20 @@ def extract_description_lines(spec_text: str) -> list[str]:
     Returns:
         List of description lines with tabs stripped.
     """
-    lines = spec_text.splitlines()
-    start = find_line_starting_with(lines, 'Description:') + 1
-    end = find_end_of_indented_section(lines, start)
-    return [line[1:] for line in lines[start:end]]
+    match = _DESCRIPTION_RE.search(spec_text)
+    if match is None:
+        return []
+    return _DESCRIPTION_LINE_RE.findall(match.group(1))
 
 
 def replace_description_in_spec(spec_text: str, new_description_lines: list[str]) -> str:
     """Replace the Description field in a p4 changelist spec."""
-    lines = spec_text.splitlines()
-    desc_line = find_line_starting_with(lines, 'Description:')
-
-    if desc_line >= len(lines):
+    match = _DESCRIPTION_RE.search(spec_text)
+    if match is None:
         return spec_text
 
-    desc_end = find_end_of_indented_section(lines, desc_line + 1)
-
-    result_lines = lines[:desc_line + 1]
-    result_lines.extend('\t' + line for line in new_description_lines)
-    result_lines.extend(lines[desc_end:])
-
-    return '\n'.join(result_lines) + '\n'
+    new_block = ''.join(f'\t{line}\n' for line in new_description_lines)
+    return spec_text[:match.start(1)] + new_block + spec_text[match.end(1):]
 
 
 # --- changelist operations ---
@@ -172,26 +160,24 @@ def add_review_keyword_to_changelist(changelist: str, workspace_dir: str,
         log.info(f"Would add #review keyword to changelist {changelist}")
         return
 
-    # Get current changelist description
-    res = run(['p4', 'change', '-o', changelist], cwd=workspace_dir)
-
-    lines = res.stdout
-    desc_start = find_line_starting_with(lines, 'Description:')
-    if desc_start >= len(lines):
+    spec_text = get_changelist_spec(changelist, workspace_dir)
+    match = _DESCRIPTION_RE.search(spec_text)
+    if match is None:
         raise CommandError('No Description: field found in changelist spec')
 
-    desc_end = find_end_of_indented_section(lines, desc_start + 1)
-
     # Check if #review is already in the description
-    if any('#review' in line for line in lines[desc_start:desc_end]):
+    description = match.group(1)
+    if '#review' in description:
         log.info(f'Changelist {changelist} already has #review keyword')
         return
 
     # Insert #review at the end of the description, preceded by a blank line
-    lines[desc_end:desc_end] = ['\t', '\t#review']
+    if description and not description.endswith('\n'):
+        description += '\n'
+    new_spec = (spec_text[:match.start(1)] + description + '\t\n\t#review\n'
+                + spec_text[match.end(1):])
 
-    run(['p4', 'change', '-i'], cwd=workspace_dir,
-        input='\n'.join(lines))
+    run(['p4', 'change', '-i'], cwd=workspace_dir, input=new_spec)
 
 
 def get_latest_changelist(depot_root: str, workspace_dir: str) -> int:
@@ -206,51 +192,139 @@ def get_latest_changelist(depot_root: str, workspace_dir: str) -> int:
 
 # --- file operations ---
 
-def get_changelist_for_file(filename: str, workspace_dir: str) -> tuple[str, str] | None:
-    """Return (changelist, action) for an opened file, or None if not opened."""
-    res = run(['p4', '-ztag', 'opened', filename], cwd=workspace_dir)
-    fields = parse_ztag_output(res.stdout)
-    change = fields.get('change')
-    if change is None:
-        return None
-    return (change, fields.get('action', ''))
+# Per-file fstat -Ro warnings for files that are simply not opened. A file
+# outside the client view is not opened either; opening it later reports
+# the problem without aborting the command.
+_NOT_OPENED_MESSAGES = (' - no such file(s).',
+                        ' - file(s) not opened on this client.',
+                        ' - file(s) not in client view.')
+
+
+def _real_path(filename: str, workspace_dir: str) -> str:
+    """Return a comparable absolute path with symlinks resolved."""
+    return os.path.normcase(os.path.realpath(
+        os.path.join(workspace_dir, filename)))
+
 
+def get_changelists_for_files(filenames: list[str], workspace_dir: str) -> dict[str, tuple[str, str]]:
+    """Return (changelist, action) for each opened file among filenames.
+
+    One fstat call covers all files, rather than a p4 opened round trip
+    per file. fstat is used over opened since it reports local paths.
+    Records are matched to the given filenames by resolved path, so a
+    client root reached through a symlink still matches. Keys are the
+    given filenames, in order; files that are not opened are omitted.
+
+    Raises RunError for any failure other than a per-file warning that
+    a file is not opened, e.g. when not logged in."""
+    if not filenames:
+        return {}
+    command = ['p4', '-x', '-', '-ztag', 'fstat', '-Ro',
+               '-T', 'clientFile,action,change']
+    res = run(command, cwd=workspace_dir,
+              input='\n'.join(filenames) + '\n', fail_on_returncode=False)
+    errors = [line for line in res.stderr
+              if line.strip() and not line.endswith(_NOT_OPENED_MESSAGES)]
+    if errors or (res.returncode != 0 and not res.stderr):
+        raise RunError(join_command_line(command),
+                       returncode=res.returncode or 1, stderr=errors)
+
+    by_path = {_real_path(filename, workspace_dir): filename
+               for filename in filenames}
+    found = {}
+    for record in parse_ztag_multi_output(res.stdout):
+        client_file = record.get('clientFile')
+        change = record.get('change')
+        if not client_file or change is None:
+            continue
+        filename = by_path.get(_real_path(client_file, workspace_dir))
+        if filename is not None:
+            found[filename] = (change, record.get('action', ''))
+    return {filename: found[filename]
+            for filename in filenames if filename in found}
+
+
+def _run_for_files(command: list[str], filenames: list[str],
+                   workspace_dir: str, dry_run: bool,
+                   fail_on_returncode: bool = True,
+                   separator: str = '\n') -> RunResult:
+    """Run a command once for a list of files passed on stdin.
+
+    command must read its file arguments from stdin (p4 -x -, git
+    --pathspec-from-file=-), which also keeps long lists clear of
+    command-line length limits. The files are listed on a dry run, since
+    the echoed command line does not show them."""
+    result = run(command, cwd=workspace_dir, dry_run=dry_run,
+                 input=''.join(f'{filename}{separator}'
+                               for filename in filenames),
+                 fail_on_returncode=fail_on_returncode)
+    if dry_run:
+        for filename in filenames:
+            log.info(f'  {filename}')
+    return result
+
+
+def _p4_tagged_problems(lines: list[str]) -> list[str]:
+    """Return the messages of error/warning lines in p4 -s output."""
+    problems = []
+    for line in lines:
+        tag, sep, message = line.partition(': ')
+        if sep and tag in ('error', 'warning'):
+            problems.append(message)
+    return problems
 
-def _open_in_changelist(filename: str, p4_action: str, changelist: str,
+
+def _open_in_changelist(filenames: list[str], p4_action: str, changelist: str,
                         workspace_dir: str, dry_run: bool) -> None:
-    """Run a p4 open action (add/edit/delete) and warn if it did not open.
+    """Run a p4 open action (add/edit/delete) on files and warn if any did not open.
 
     Per-file problems must not abort the whole command: p4 exits 0 for
     some ("can't add existing file", "file(s) not in client view") and
     non-zero for others ("ignored file can't be added" for files matching
-    .p4ignore), only printing the reason either way. A successful open is
-    confirmed by its "opened for" output line; anything else is surfaced
-    as a warning with p4's message so the user can act on it."""
-    result = run(['p4', p4_action, '-c', changelist, filename],
-                 cwd=workspace_dir, dry_run=dry_run,
-                 fail_on_returncode=False)
+    .p4ignore). With -s, p4 tags every output line with its severity, so
+    the per-file errors are told apart from successful opens without
+    depending on the wording of either. They are surfaced as a warning
+    with p4's message so the user can act on it."""
+    if not filenames:
+        return
+    result = _run_for_files(
+        ['p4', '-s', '-x', '-', p4_action, '-c', changelist],
+        filenames, workspace_dir, dry_run, fail_on_returncode=False)
     if dry_run:
         return
-    output = result.stdout + result.stderr
-    if not any('opened for' in line for line in output):
-        log.warning(f'p4 {p4_action} did not open {filename}:')
-        for line in output:
-            log.info(f'  {line}')
+    problems = _p4_tagged_problems(result.stdout + result.stderr)
+    if problems:
+        log.warning(f'p4 {p4_action} reported {len(problems)} problem(s):')
+        for message in problems:
+            log.info(f'  {message}')
+    elif result.returncode != 0:
+        log.warning(f'p4 {p4_action} exited with code {result.returncode}')
+
+
+class _ChangelistPlan:
+    """p4 operations needed to get files into a changelist, by kind."""
+
+    def __init__(self) -> None:
+        self.reverts: list[str] = []
+        self.opens: dict[str, list[str]] = {
+            'add': [], 'edit': [], 'delete': []}
+        self.reopens: list[str] = []
+        self.restores: list[str] = []
 
 
-def _ensure_in_changelist(filename: str, p4_action: str, changelist: str,
-                          workspace_dir: str, dry_run: bool) -> None:
-    """Ensure a file is opened with the correct action in the given changelist.
+def _plan_for_file(plan: _ChangelistPlan, filename: str, p4_action: str,
+                   changelist: str,
+                   opened: dict[str, tuple[str, str]]) -> None:
+    """Record what it takes for a file to be opened with the correct action in the given changelist.
 
     If the file is not yet opened, run the specified p4 action (add, edit, delete).
     If it's already opened with a different action, revert and reopen.
     If it's already opened with the correct action in a different changelist, reopen it.
     If it's already in the correct changelist with the correct action, do nothing.
     """
-    result = get_changelist_for_file(filename, workspace_dir)
+    result = opened.get(filename)
     if result is None:
-        _open_in_changelist(filename, p4_action, changelist,
-                            workspace_dir, dry_run)
+        plan.opens[p4_action].append(filename)
         return
 
     current_cl, current_action = result
@@ -263,44 +337,59 @@ def _ensure_in_changelist(filename: str, p4_action: str, changelist: str,
         # This happens when a file is added in one commit and modified in the next.
         if current_action == 'add' and p4_action == 'edit':
             if current_cl != changelist:
-                run(['p4', 'reopen', '-c', changelist, filename],
-                    cwd=workspace_dir, dry_run=dry_run)
+                plan.reopens.append(filename)
             return
 
-        run(['p4', 'revert', filename], cwd=workspace_dir, dry_run=dry_run)
+        plan.reverts.append(filename)
         # For add -> delete: the file never existed in the depot, so just revert.
         if current_action == 'add' and p4_action == 'delete':
             return
-        _open_in_changelist(filename, p4_action, changelist,
-                            workspace_dir, dry_run)
+        plan.opens[p4_action].append(filename)
         if p4_action != 'delete':
-            run(['git', 'restore', filename],
-                cwd=workspace_dir, dry_run=dry_run)
+            plan.restores.append(filename)
     elif current_cl != changelist:
-        run(['p4', 'reopen', '-c', changelist, filename],
-            cwd=workspace_dir, dry_run=dry_run)
+        plan.reopens.append(filename)
 
 
 def include_changes_in_changelist(changes: LocalChanges, changelist: str,
                                   workspace_dir: str, dry_run: bool = False) -> None:
-    """Open local git changes for add/edit/delete in a Perforce changelist."""
-    for filename in changes.adds:
-        _ensure_in_changelist(filename, 'add', changelist,
-                              workspace_dir, dry_run)
+    """Open local git changes for add/edit/delete in a Perforce changelist.
 
-    for filename in changes.mods:
-        _ensure_in_changelist(filename, 'edit', changelist,
-                              workspace_dir, dry_run)
+    Files are grouped by the operation they need, and each group is run
+    as a single command rather than one process and server round trip
+    per file. The per-file order is kept: revert, open, then restore."""
+    filenames = changes.adds + changes.mods + changes.dels
+    for from_filename, to_filename in changes.moves:
+        filenames += [from_filename, to_filename]
+    opened = get_changelists_for_files(filenames, workspace_dir)
 
+    plan = _ChangelistPlan()
+    for filename in changes.adds:
+        _plan_for_file(plan, filename, 'add', changelist, opened)
+    for filename in changes.mods:
+        _plan_for_file(plan, filename, 'edit', changelist, opened)
     for filename in changes.dels:
-        _ensure_in_changelist(filename, 'delete',
-                              changelist, workspace_dir, dry_run)
-
+        _plan_for_file(plan, filename, 'delete', changelist, opened)
     for from_filename, to_filename in changes.moves:
-        _ensure_in_changelist(from_filename, 'delete',
-                              changelist, workspace_dir, dry_run)
-        _ensure_in_changelist(to_filename, 'add',
-                              changelist, workspace_dir, dry_run)
+        _plan_for_file(plan, from_filename, 'delete', changelist, opened)
+        _plan_for_file(plan, to_filename, 'add', changelist, opened)
+
+    if plan.reverts:
+        _run_for_files(['p4', '-x', '-', 'revert'], plan.reverts,
+                       workspace_dir, dry_run)
+    for p4_action, filenames in plan.opens.items():
+        _open_in_changelist(filenames, p4_action, changelist,
+                            workspace_dir, dry_run)
+    if plan.reopens:
+        _run_for_files(['p4', '-x', '-', 'reopen', '-c', changelist],
+                       plan.reopens, workspace_dir, dry_run)
+    if plan.restores:
+        # NUL-separated, so names are taken verbatim rather than split
+        # on newlines and unquoted (needs git 2.26+).
+        _run_for_files(['git', 'restore', '--pathspec-from-file=-',
+                        '--pathspec-file-nul'],
+                       plan.restores, workspace_dir, dry_run,
+                       separator='\0')
 
 
 def _p4_action_to_change(action: str) -> str:
@@ -356,22 +445,34 @@ def get_writable_files(stderr_lines: list[str]) -> list[str]:
             for line in stderr_lines if line.startswith(prefix)]
 
 
+# p4 sync per-file lines read "<depot path>#<rev> - <marker> <local path>",
+# where <rev> is "none" for files deleted by syncing to before they
+# existed. Depot paths cannot contain a literal '#', so anchoring on the
+# revision finds the real marker even when either path contains " - ".
+_SYNC_LINE_RE = re.compile(r'#(?:\d+|none) - (updating|added as|deleted as) ')
+_SYNC_LINE_MODES = {
+    'updating': 'upd',
+    'added as': 'add',
+    'deleted as': 'del',
+}
+_SYNC_CLOBBER_PREFIX = "Can't clobber writable file "
+
+
 def parse_p4_sync_line(line: str) -> tuple[str | None, str | None]:
     """Parse a line from p4 sync output."""
-    patterns = [
-        ('add', ' - added as '),
-        ('del', ' - deleted as '),
-        ('upd', ' - updating '),
-        ('clb', "Can't clobber writable file ")
-    ]
-    for mode, pattern in patterns:
-        tokens = line.split(pattern)
-        if len(tokens) == 2:
-            return (mode, tokens[1])
+    match = _SYNC_LINE_RE.search(line)
+    if match:
+        return (_SYNC_LINE_MODES[match.group(1)], line[match.end():])
+    if line.startswith(_SYNC_CLOBBER_PREFIX):
+        return ('clb', line[len(_SYNC_CLOBBER_PREFIX):])
 
     return (None, None)
 
 
+# p4 sync output when the workspace is already at the requested revision.
+_SYNC_UP_TO_DATE_RE = re.compile(r'@\d+ - file\(s\) up-to-date\.')
+
+
 class P4SyncOutputProcessor:
     """Process p4 sync output in real-time."""
 
@@ -381,7 +482,8 @@ class P4SyncOutputProcessor:
             mode: 0 for mode in ['add', 'del', 'upd', 'clb']}
 
     def __call__(self, line: str, stream: IO[str]) -> None:
-        if re.search(r"@\d+ - file\(s\) up-to-date\.", line):
+        # The literal check skips the regex on every per-file line.
+        if 'up-to-date.' in line and _SYNC_UP_TO_DATE_RE.search(line):
             log.info('all files up to date')
             return
 
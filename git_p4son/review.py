@@ -15,6 +15,11 @@ from .git import get_commit_lines_since, resolve_editor
 from .log import log
 
 
+# Editor resolved by review_command, handed to the sequence editor so it
+# does not have to run git var GIT_EDITOR again.
+_EDITOR_ENV = 'GIT_P4SON_EDITOR'
+
+
 def _reviews_dir(workspace_dir: str) -> str:
     """Return the path to the reviews directory."""
     return os.path.join(workspace_dir, CONFIG_DIR, 'reviews')
@@ -28,6 +33,14 @@ def _todo_path(workspace_dir: str) -> str:
 def _generate_todo(commit_lines: list[str], alias: str, message: str,
                    force: bool) -> str:
     """Generate the rebase todo content with exec lines."""
+    quoted_alias = shlex.quote(alias)
+    # First commit: create new changelist with review
+    new_cmd = f'new {quoted_alias} --review -m {shlex.quote(message)}'
+    if force:
+        new_cmd += ' --force'
+    # Subsequent commits: update and shelve
+    update_cmd = f'update {quoted_alias} --shelve'
+
     lines = []
     last_index = len(commit_lines) - 1
     for i, commit_line in enumerate(commit_lines):
@@ -37,14 +50,7 @@ def _generate_todo(commit_lines: list[str], alias: str, message: str,
 
         lines.append(f'pick {commit_hash} {subject}')
 
-        if i == 0:
-            # First commit: create new changelist with review
-            cmd = f'new {shlex.quote(alias)} --review -m {shlex.quote(message)}'
-            if force:
-                cmd += ' --force'
-        else:
-            # Subsequent commits: update and shelve
-            cmd = f'update {shlex.quote(alias)} --shelve'
+        cmd = new_cmd if i == 0 else update_cmd
 
         # Sleep after all exec lines except the last
         if i < last_index:
@@ -124,6 +130,7 @@ def review_command(args: argparse.Namespace) -> int:
         log.heading('Running interactive rebase')
         env = os.environ.copy()
         env['GIT_SEQUENCE_EDITOR'] = 'git-p4son _sequence-editor'
+        env[_EDITOR_ENV] = editor
         result = subprocess.run(
             ['git', 'rebase', '-i', args.base_branch],
             cwd=workspace_dir,
@@ -148,27 +155,26 @@ def sequence_editor_command(args: argparse.Namespace) -> int:
     workspace_dir = args.workspace_dir
     todo_file = _todo_path(workspace_dir)
 
-    if not os.path.exists(todo_file):
+    # Read our generated todo, opening it directly rather than checking
+    # exists() first.
+    try:
+        with open(todo_file, 'r') as f:
+            todo_content = f.read()
+    except FileNotFoundError:
         log.error(f'No review todo file found at {todo_file}')
         return 1
 
     # Read the original git todo file to preserve comment lines
     with open(args.filename, 'r') as f:
-        original_lines = f.readlines()
-    comment_lines = [line for line in original_lines if line.startswith('#')]
-
-    # Read our generated todo
-    with open(todo_file, 'r') as f:
-        todo_content = f.read()
+        comment_lines = [line for line in f if line.startswith('#')]
 
     # Overwrite the rebase todo file with our version plus git's comments
+    if comment_lines:
+        todo_content += '\n' + ''.join(comment_lines)
     with open(args.filename, 'w') as f:
         f.write(todo_content)
-        if comment_lines:
-            f.write('\n')
-            f.writelines(comment_lines)
 
-    editor = resolve_editor(workspace_dir)
+    editor = os.environ.get(_EDITOR_ENV) or resolve_editor(workspace_dir)
     if not editor:
         log.error(
             'No git editor configured. Set one with: git config core.editor <editor>')
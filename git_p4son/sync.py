@@ -42,6 +42,11 @@ class LastSync:
     commit: str
 
 
+# Subject of a sync commit, e.g. "git-p4son: p4 sync //depot/...@123".
+_SYNC_COMMIT_SUBJECT_RE = re.compile(
+    r'^(\d+|pergit|git-p4son): p4 sync //.+@(\d+)$')
+
+
 def git_last_sync(workspace_dir: str) -> LastSync | None:
     """Get the changelist number and commit SHA of the most recent sync commit."""
     res = run_with_output(
@@ -58,8 +63,7 @@ def git_last_sync(workspace_dir: str) -> LastSync | None:
         return None
 
     commit_hash, subject = parts
-    pattern = r"^(\d+|pergit|git-p4son): p4 sync //.+@(\d+)$"
-    match = re.search(pattern, subject)
+    match = _SYNC_COMMIT_SUBJECT_RE.search(subject)
     if not match:
         return None
 
@@ -3,9 +3,11 @@
 import os
 import tempfile
 import unittest
+from unittest import mock
 
 from git_p4son.changelist_store import (
     delete_changelist_alias,
+    list_changelist_aliases,
     load_changelist_alias,
     save_changelist_alias,
     validate_alias_name,
@@ -29,6 +31,13 @@ class TestAliasStoreValidatesNames(unittest.TestCase):
         self.assertTrue(delete_changelist_alias('feature', self.ws))
         self.assertIsNone(load_changelist_alias('feature', self.ws))
 
+    def test_delete_missing_alias(self):
+        save_changelist_alias('some-alias', '1', self.ws)
+        self.assertFalse(delete_changelist_alias('feature', self.ws))
+
+    def test_load_without_store_dir(self):
+        self.assertIsNone(load_changelist_alias('feature', self.ws))
+
     def test_load_rejects_path_traversal(self):
         # The store directory must exist for the relative path to resolve.
         save_changelist_alias('some-alias', '1', self.ws)
@@ -51,6 +60,105 @@ class TestAliasStoreValidatesNames(unittest.TestCase):
         self.assertTrue(os.path.exists(outside))
 
 
+class TestSaveChangelistAlias(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.ws = self._tempdir.name
+        self.store = os.path.join(self.ws, '.git-p4son', 'changelists')
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_creates_store_dir(self):
+        self.assertTrue(save_changelist_alias('feature', '123', self.ws))
+        with open(os.path.join(self.store, 'feature')) as f:
+            self.assertEqual(f.read(), '123\n')
+
+    def test_existing_alias_kept_without_force(self):
+        save_changelist_alias('feature', '123', self.ws)
+        self.assertFalse(save_changelist_alias('feature', '456', self.ws))
+        self.assertEqual(load_changelist_alias('feature', self.ws), '123')
+
+    def test_force_overwrites_without_leftovers(self):
+        save_changelist_alias('feature', '123', self.ws)
+        self.assertTrue(
+            save_changelist_alias('feature', '456', self.ws, force=True))
+        self.assertEqual(load_changelist_alias('feature', self.ws), '456')
+        self.assertEqual(os.listdir(self.store), ['feature'])
+
+    def test_force_keeps_umask_mode(self):
+        save_changelist_alias('feature', '123', self.ws)
+        old_mask = os.umask(0o022)
+        try:
+            save_changelist_alias('feature', '456', self.ws, force=True)
+        finally:
+            os.umask(old_mask)
+        mode = os.stat(os.path.join(self.store, 'feature')).st_mode
+        self.assertEqual(mode & 0o777, 0o644)
+
+    def test_force_replaces_stale_temp_file(self):
+        save_changelist_alias('feature', '123', self.ws)
+        with open(os.path.join(self.store, '.feature.tmp'), 'w') as f:
+            f.write('999\n')
+        self.assertTrue(
+            save_changelist_alias('feature', '456', self.ws, force=True))
+        self.assertEqual(load_changelist_alias('feature', self.ws), '456')
+        self.assertEqual(os.listdir(self.store), ['feature'])
+
+    def test_force_cleans_up_when_replace_fails(self):
+        save_changelist_alias('feature', '123', self.ws)
+        with mock.patch('git_p4son.changelist_store.os.replace',
+                        side_effect=OSError('boom')):
+            with self.assertRaises(OSError):
+                save_changelist_alias('feature', '456', self.ws, force=True)
+        self.assertEqual(os.listdir(self.store), ['feature'])
+        self.assertEqual(load_changelist_alias('feature', self.ws), '123')
+
+
+class TestListChangelistAliases(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.ws = self._tempdir.name
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_missing_store_dir(self):
+        self.assertEqual(list_changelist_aliases(self.ws), [])
+
+    def test_sorted_by_name(self):
+        save_changelist_alias('zeta', '3', self.ws)
+        save_changelist_alias('alpha', '1', self.ws)
+        self.assertEqual(list_changelist_aliases(self.ws),
+                         [('alpha', '1'), ('zeta', '3')])
+
+    def test_skips_directories_and_empty_files(self):
+        save_changelist_alias('feature', '123', self.ws)
+        store = os.path.join(self.ws, '.git-p4son', 'changelists')
+        os.mkdir(os.path.join(store, 'subdir'))
+        open(os.path.join(store, 'empty'), 'w').close()
+        self.assertEqual(list_changelist_aliases(self.ws),
+                         [('feature', '123')])
+
+    def test_repeated_listing_is_cached(self):
+        save_changelist_alias('feature', '123', self.ws)
+        list_changelist_aliases(self.ws)
+        with mock.patch('git_p4son.changelist_store.os.scandir') as scandir:
+            aliases = list_changelist_aliases(self.ws)
+        scandir.assert_not_called()
+        self.assertEqual(aliases, [('feature', '123')])
+
+    def test_save_and_delete_invalidate_cache(self):
+        save_changelist_alias('feature', '123', self.ws)
+        list_changelist_aliases(self.ws)
+        # A forced overwrite must show up in the next listing.
+        save_changelist_alias('feature', '456', self.ws, force=True)
+        self.assertEqual(list_changelist_aliases(self.ws),
+                         [('feature', '456')])
+        delete_changelist_alias('feature', self.ws)
+        self.assertEqual(list_changelist_aliases(self.ws), [])
+
+
 class TestValidateAliasName(unittest.TestCase):
     def test_simple_name(self):
         self.assertIsNone(validate_alias_name('my-feature'))
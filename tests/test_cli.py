@@ -1,14 +1,90 @@
 """Tests for git_p4son.cli module."""
 
 import contextlib
+import importlib
 import io
+import subprocess
+import sys
 import unittest
 from unittest import mock
 
-from git_p4son.cli import create_parser, run_command, _resolve_branch_keyword
+from git_p4son import __version__
+from git_p4son.cli import (
+    _COMMAND_HANDLERS,
+    _SUBPARSER_BUILDERS,
+    _resolve_branch_keyword,
+    create_parser,
+    main,
+    run_command,
+)
 from git_p4son.git import get_head_subject
 
 
+class TestLazyImports(unittest.TestCase):
+    def test_cli_import_skips_subcommand_modules(self):
+        code = ('import sys, git_p4son.cli; '
+                'print(sorted(m for m in sys.modules if m in {'
+                '"git_p4son.sync", "git_p4son.new", "git_p4son.update", '
+                '"git_p4son.review", "git_p4son.alias", "git_p4son.init", '
+                '"git_p4son.complete", "git_p4son.perforce"}))')
+        result = subprocess.run([sys.executable, '-c', code],
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), '[]')
+
+
+class TestCommandHandlers(unittest.TestCase):
+    def test_every_workspace_command_has_a_handler(self):
+        # init and completion are dispatched by main() before run_command.
+        self.assertEqual(set(_COMMAND_HANDLERS),
+                         set(_SUBPARSER_BUILDERS) - {'init', 'completion'})
+
+    def test_handlers_resolve(self):
+        for module_name, function_name in _COMMAND_HANDLERS.values():
+            module = importlib.import_module(module_name, 'git_p4son')
+            self.assertTrue(callable(getattr(module, function_name)))
+
+
+class TestMainVersion(unittest.TestCase):
+    @mock.patch('git_p4son.cli.create_parser')
+    def test_version_skips_parser(self, mock_create_parser):
+        out = io.StringIO()
+        with mock.patch.object(sys, 'argv', ['git-p4son', '--version']), \
+                contextlib.redirect_stdout(out):
+            rc = main()
+        self.assertEqual(rc, 0)
+        self.assertEqual(out.getvalue(), f'git-p4son {__version__}\n')
+        mock_create_parser.assert_not_called()
+
+    def test_version_matches_parser_output(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), \
+                self.assertRaises(SystemExit):
+            create_parser().parse_args(['--version'])
+        self.assertEqual(out.getvalue(), f'git-p4son {__version__}\n')
+
+
+class TestCreateParserForCommand(unittest.TestCase):
+    def _commands(self, parser):
+        return set(parser._subparsers._group_actions[0].choices)
+
+    def test_known_command_registers_only_that_subparser(self):
+        parser = create_parser('sync')
+        self.assertEqual(self._commands(parser), {'sync'})
+        args = parser.parse_args(['sync', '12345'])
+        self.assertEqual(args.changelist, ['12345'])
+
+    def test_parser_is_reused(self):
+        self.assertIs(create_parser('sync'), create_parser('sync'))
+        self.assertIs(create_parser('bogus'), create_parser())
+        self.assertIsNot(create_parser('sync'), create_parser())
+
+    def test_unknown_or_missing_command_registers_all(self):
+        everything = self._commands(create_parser())
+        self.assertIn('_sequence-editor', everything)
+        self.assertEqual(self._commands(create_parser('-v')), everything)
+        self.assertEqual(self._commands(create_parser('bogus')), everything)
+
+
 class TestCreateParser(unittest.TestCase):
     def setUp(self):
         self.parser = create_parser()
@@ -120,7 +196,7 @@ class TestCreateParser(unittest.TestCase):
 
 @mock.patch('git_p4son.cli.get_workspace_dir', return_value='/ws')
 class TestRunCommand(unittest.TestCase):
-    @mock.patch('git_p4son.cli.sync_command', return_value=0)
+    @mock.patch('git_p4son.sync.sync_command', return_value=0)
     def test_dispatches_sync(self, mock_sync, _ws):
         parser = create_parser()
         args = parser.parse_args(['sync', '100'])
@@ -129,7 +205,7 @@ class TestRunCommand(unittest.TestCase):
         self.assertEqual(result, 0)
 
     @mock.patch('git_p4son.cli.get_current_branch', return_value='feat/x')
-    @mock.patch('git_p4son.cli.new_command', return_value=0)
+    @mock.patch('git_p4son.new.new_command', return_value=0)
     def test_dispatches_new(self, mock_new, _branch, _ws):
         parser = create_parser()
         args = parser.parse_args(['new', '-m', 'msg'])
@@ -139,7 +215,7 @@ class TestRunCommand(unittest.TestCase):
 
     @mock.patch('git_p4son.cli.get_head_subject', return_value='Add feature')
     @mock.patch('git_p4son.cli.get_current_branch', return_value='feat/x')
-    @mock.patch('git_p4son.cli.new_command', return_value=0)
+    @mock.patch('git_p4son.new.new_command', return_value=0)
     def test_new_defaults_message_from_head(self, mock_new, _branch, _head, _ws):
         parser = create_parser()
         args = parser.parse_args(['new'])
@@ -150,7 +226,7 @@ class TestRunCommand(unittest.TestCase):
 
     @mock.patch('git_p4son.cli.get_head_subject', return_value='Add feature')
     @mock.patch('git_p4son.cli.get_current_branch', return_value='feat/x')
-    @mock.patch('git_p4son.cli.new_command', return_value=0)
+    @mock.patch('git_p4son.new.new_command', return_value=0)
     def test_new_explicit_message_takes_precedence(self, mock_new, _branch, _head, _ws):
         parser = create_parser()
         args = parser.parse_args(['new', '-m', 'Explicit msg'])
@@ -169,7 +245,7 @@ class TestRunCommand(unittest.TestCase):
 
     @mock.patch('git_p4son.cli.get_head_subject', return_value='Review change')
     @mock.patch('git_p4son.cli.get_current_branch', return_value='feat/bar')
-    @mock.patch('git_p4son.cli.review_command', return_value=0)
+    @mock.patch('git_p4son.review.review_command', return_value=0)
     def test_review_defaults_message_from_head(self, mock_review, _branch, _head, _ws):
         parser = create_parser()
         args = parser.parse_args(['review'])
@@ -178,7 +254,7 @@ class TestRunCommand(unittest.TestCase):
         mock_review.assert_called_once_with(args)
         self.assertEqual(result, 0)
 
-    @mock.patch('git_p4son.cli.update_command', return_value=0)
+    @mock.patch('git_p4son.update.update_command', return_value=0)
     def test_dispatches_update(self, mock_update, _ws):
         parser = create_parser()
         args = parser.parse_args(['update', '100'])
@@ -186,7 +262,7 @@ class TestRunCommand(unittest.TestCase):
         mock_update.assert_called_once_with(args)
         self.assertEqual(result, 0)
 
-    @mock.patch('git_p4son.cli.list_changes_command', return_value=0)
+    @mock.patch('git_p4son.list_changes.list_changes_command', return_value=0)
     def test_dispatches_list_changes(self, mock_lc, _ws):
         parser = create_parser()
         args = parser.parse_args(['list-changes'])
@@ -206,7 +282,7 @@ class TestResolveBranchKeyword(unittest.TestCase):
 
     @mock.patch('git_p4son.cli.get_current_branch', return_value='feat/bar')
     @mock.patch('git_p4son.cli.get_workspace_dir', return_value='/ws')
-    @mock.patch('git_p4son.cli.review_command', return_value=0)
+    @mock.patch('git_p4son.review.review_command', return_value=0)
     def test_run_command_resolves_at_branch_for_review(
             self, mock_review, _ws, _branch):
         args = self.parser.parse_args(['review', '-m', 'msg'])
@@ -229,7 +305,7 @@ class TestResolveBranchKeyword(unittest.TestCase):
         args = self.parser.parse_args(['new', '-m', 'msg'])
         self.assertEqual(args.alias, 'branch')
 
-    @mock.patch('git_p4son.cli.new_command', return_value=0)
+    @mock.patch('git_p4son.new.new_command', return_value=0)
     @mock.patch('git_p4son.cli.get_workspace_dir', return_value='/ws')
     @mock.patch('git_p4son.cli.get_current_branch', return_value='feat/xyz')
     def test_no_alias_skips_resolution(self, _branch, _ws, mock_new):
@@ -238,7 +314,7 @@ class TestResolveBranchKeyword(unittest.TestCase):
         self.assertIsNone(args.alias)
         self.assertEqual(result, 0)
 
-    @mock.patch('git_p4son.cli.new_command', return_value=0)
+    @mock.patch('git_p4son.new.new_command', return_value=0)
     @mock.patch('git_p4son.cli.get_workspace_dir', return_value='/ws')
     def test_explicit_alias_unchanged(self, _ws, mock_new):
         args = self.parser.parse_args(['new', '-m', 'msg', 'myalias'])
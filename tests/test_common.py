@@ -253,6 +253,16 @@ class TestRunResult(unittest.TestCase):
         self.assertEqual(r.stderr, ['err1'])
         self.assertIsNone(r.elapsed)
 
+    def test_text_output_split_on_access(self):
+        r = RunResult(0, 'a\nb\n', '')
+        self.assertEqual(r.stdout, ['a', 'b'])
+        self.assertIs(r.stdout, r.stdout)
+        self.assertEqual(r.stderr, [])
+
+    def test_bytes_output_kept(self):
+        r = RunResult(0, b'a\nb\n', b'')
+        self.assertEqual(r.stdout, b'a\nb\n')
+
     def test_elapsed_field(self):
         from datetime import timedelta
         r = RunResult(0, [], [], elapsed=timedelta(seconds=1.5))
@@ -335,6 +345,26 @@ class TestRunWithOutput(unittest.TestCase):
                           for call in callback.call_args_list]
         self.assertIn('hello', callback_lines)
 
+    @mock.patch('subprocess.Popen')
+    def test_callback_receives_matching_stream(self, mock_popen_cls):
+        mock_process = mock.MagicMock()
+        mock_process.stdout.readline = mock.Mock(side_effect=['out\n', ''])
+        mock_process.stderr.readline = mock.Mock(side_effect=['err\n', ''])
+        mock_process.wait.return_value = 0
+        mock_process.__enter__ = mock.Mock(return_value=mock_process)
+        mock_process.__exit__ = mock.Mock(return_value=False)
+        mock_popen_cls.return_value = mock_process
+
+        seen = {}
+
+        def callback(line, stream):
+            seen[line] = stream
+
+        result = run_with_output(['cmd'], on_output=callback)
+        self.assertEqual(result.stdout, ['out'])
+        self.assertEqual(result.stderr, ['err'])
+        self.assertEqual(seen, {'out': sys.stdout, 'err': sys.stderr})
+
     def test_captures_all_output_from_fast_exiting_process(self):
         """A process that bursts output and exits must not lose tail lines.
 
@@ -12,6 +12,7 @@ from git_p4son.cli import create_parser
 from git_p4son.complete import (
     _complete,
     _filter,
+    _find_flag_action,
     _flag_takes_value,
     _get_flags,
     run_complete,
@@ -52,6 +53,15 @@ class TestRunCompleteOutput(unittest.TestCase):
             self.assertNotIn('\r', line)
             self.assertNotIn('\x1b', line)
 
+    @mock.patch('git_p4son.complete.get_workspace_dir', return_value=None)
+    @mock.patch('git_p4son.complete._complete',
+                return_value=[('sync', 'Sync it'), ('bare', '')])
+    def test_formats_candidates(self, _complete_mock, _ws):
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            run_complete([''])
+        self.assertEqual(buffer.getvalue(), 'sync\tSync it\nbare\n')
+
 
 class TestGetFlags(unittest.TestCase):
     def test_extracts_flags_from_parser(self):
@@ -83,6 +93,26 @@ class TestGetFlags(unittest.TestCase):
         self.assertIn('--version', flag_names)
 
 
+class TestFindFlagAction(unittest.TestCase):
+    def test_finds_short_and_long_forms(self):
+        parser = argparse.ArgumentParser()
+        parser.add_argument('-m', '--message')
+        self.assertIs(_find_flag_action(parser, '-m'),
+                      _find_flag_action(parser, '--message'))
+        self.assertEqual(_find_flag_action(parser, '-m').dest, 'message')
+
+    def test_unknown_flag(self):
+        parser = argparse.ArgumentParser()
+        self.assertIsNone(_find_flag_action(parser, '--nope'))
+
+
+class TestAliasLookupIsLazy(unittest.TestCase):
+    @mock.patch('git_p4son.complete.list_changelist_aliases')
+    def test_sync_completion_does_not_read_aliases(self, mock_list):
+        _complete(create_parser(), ['sync', ''], workspace_dir='/ws')
+        mock_list.assert_not_called()
+
+
 class TestFlagTakesValue(unittest.TestCase):
     def test_store_true_returns_false(self):
         parser = argparse.ArgumentParser()
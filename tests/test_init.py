@@ -1,6 +1,8 @@
 """Tests for git_p4son.init module."""
 
 import os
+import stat
+import tempfile
 import unittest
 from unittest import mock
 
@@ -57,7 +59,7 @@ class TestSetupGitignore(unittest.TestCase):
             return path.endswith('.p4ignore')
 
         with mock.patch('os.path.exists', side_effect=exists_side_effect), \
-                mock.patch('shutil.copy2') as mock_copy:
+                mock.patch('shutil.copyfile') as mock_copy:
             result = _setup_gitignore('/ws')
             self.assertEqual(result, 'copied .p4ignore to new .gitignore')
             mock_copy.assert_called_once_with(
@@ -72,6 +74,20 @@ class TestSetupGitignore(unittest.TestCase):
             mock_file.assert_called_once_with(
                 os.path.join('/ws', '.gitignore'), 'w')
 
+    def test_copy_of_read_only_p4ignore_is_writable(self):
+        """p4 keeps files read-only until opened for edit; .gitignore must
+        not inherit that mode."""
+        with tempfile.TemporaryDirectory() as ws:
+            p4ignore = os.path.join(ws, '.p4ignore')
+            with open(p4ignore, 'w') as f:
+                f.write('*.obj\n')
+            os.chmod(p4ignore, 0o444)
+            _setup_gitignore(ws)
+            gitignore = os.path.join(ws, '.gitignore')
+            with open(gitignore) as f:
+                self.assertEqual(f.read(), '*.obj\n')
+            self.assertTrue(os.stat(gitignore).st_mode & stat.S_IWUSR)
+
 
 class TestSelectDepotRoot(unittest.TestCase):
     @mock.patch('builtins.input', side_effect=EOFError)
@@ -35,6 +35,19 @@ Files:
 \t//depot/src/login.py\t# edit
 """
 
+SAMPLE_SPEC_WITH_MARKER = """\
+Change:\t12345
+
+Description:
+\tFix the login bug
+\t
+\tChanges included:
+\t1. Add validation
+\t2. Fix redirect
+
+Files:
+"""
+
 SAMPLE_SPEC_NO_COMMITS = """\
 Change:\tnew
 
@@ -59,6 +72,16 @@ class TestExtractDescriptionLines(unittest.TestCase):
         lines = extract_description_lines('')
         self.assertEqual(lines, [])
 
+    def test_description_at_end_without_newline(self):
+        lines = extract_description_lines(
+            'Change:\tnew\n\nDescription:\n\tLast')
+        self.assertEqual(lines, ['Last'])
+
+    def test_keeps_blank_and_tabbed_lines(self):
+        spec = 'Description:\n\tTitle\n\t\n\t\tindented\n\nFiles:\n'
+        lines = extract_description_lines(spec)
+        self.assertEqual(lines, ['Title', '', '\tindented'])
+
 
 class TestReplaceDescriptionInSpec(unittest.TestCase):
     def test_replaces_description(self):
@@ -74,6 +97,17 @@ class TestReplaceDescriptionInSpec(unittest.TestCase):
         self.assertIn('Change:\t12345', new_spec)
         self.assertIn('Files:', new_spec)
 
+    def test_only_description_block_changes(self):
+        new_spec = replace_description_in_spec(SAMPLE_SPEC, ['Replaced'])
+        expected = SAMPLE_SPEC.replace(
+            '\tFix the login bug\n\t1. Add validation\n\t2. Fix redirect\n',
+            '\tReplaced\n')
+        self.assertEqual(new_spec, expected)
+
+    def test_no_description_field(self):
+        spec = 'Change:\tnew\n'
+        self.assertEqual(replace_description_in_spec(spec, ['x']), spec)
+
 
 class TestSplitDescriptionLines(unittest.TestCase):
     def test_splits_message_and_commits(self):
@@ -97,6 +131,25 @@ class TestSplitDescriptionLines(unittest.TestCase):
         self.assertEqual(commits, ['1. First', '2. Second'])
         self.assertEqual(trailing, ['Trailing note'])
 
+    def test_list_ends_at_numbering_gap(self):
+        lines = ['Message', '1. First', '2. Second', '4. Not next', 'x. y']
+        msg, commits, trailing = split_description_lines(lines)
+        self.assertEqual(commits, ['1. First', '2. Second'])
+        self.assertEqual(trailing, ['4. Not next', 'x. y'])
+
+    def test_non_ascii_digit_ends_list(self):
+        """'²' passes str.isdigit() but is not a list number."""
+        lines = ['1. a', '². b']
+        msg, commits, trailing = split_description_lines(lines)
+        self.assertEqual(commits, ['1. a'])
+        self.assertEqual(trailing, ['². b'])
+
+    def test_zero_padded_number_ends_list(self):
+        lines = ['1. a', '02. b']
+        msg, commits, trailing = split_description_lines(lines)
+        self.assertEqual(commits, ['1. a'])
+        self.assertEqual(trailing, ['02. b'])
+
     def test_empty_description(self):
         msg, commits, trailing = split_description_lines([])
         self.assertEqual(msg, [])
@@ -156,6 +209,34 @@ class TestCreateChangelist(unittest.TestCase):
         cl_num = create_changelist('Solo message', 'HEAD~1', '/ws')
         self.assertEqual(cl_num, '100')
 
+    @mock.patch('git_p4son.lib.run')
+    @mock.patch('git_p4son.lib.get_enumerated_commit_lines_since')
+    def test_spec_is_tab_indented(self, mock_get_lines, mock_run):
+        mock_get_lines.return_value = ['1. Add feature']
+        mock_run.return_value = make_run_result(
+            stdout=['Change 1 created.'])
+        create_changelist('Title\nBody', 'HEAD~1', '/ws')
+        self.assertEqual(
+            mock_run.call_args.kwargs['input'],
+            'Change: new\n\nDescription:\n\tTitle\n\tBody\n\t\n'
+            '\tChanges included:\n\t1. Add feature\n')
+
+    @mock.patch('git_p4son.lib.run')
+    @mock.patch('git_p4son.lib.get_enumerated_commit_lines_since')
+    def test_number_found_after_other_output(self, mock_get_lines, mock_run):
+        mock_get_lines.return_value = []
+        mock_run.return_value = make_run_result(
+            stdout=['Some notice', 'Change 4242 created.'])
+        self.assertEqual(create_changelist('Msg', 'HEAD~1', '/ws'), '4242')
+
+    @mock.patch('git_p4son.lib.run')
+    @mock.patch('git_p4son.lib.get_enumerated_commit_lines_since')
+    def test_unexpected_output_raises(self, mock_get_lines, mock_run):
+        mock_get_lines.return_value = []
+        mock_run.return_value = make_run_result(stdout=['Change created.'])
+        with self.assertRaises(CommandError):
+            create_changelist('Msg', 'HEAD~1', '/ws')
+
     @mock.patch('git_p4son.lib.get_enumerated_commit_lines_since')
     def test_dry_run_returns_placeholder(self, mock_get_lines):
         """Dry run returns a placeholder usable in downstream commands."""
@@ -270,6 +351,18 @@ class TestUpdateChangelist(unittest.TestCase):
         update_changelist('12345', 'HEAD~1', '/ws')
         self.assertIn('1. First commit', self._spec_input(mock_run))
 
+    @mock.patch('git_p4son.lib.run')
+    @mock.patch('git_p4son.lib.get_commit_subjects_since')
+    @mock.patch('git_p4son.lib.get_changelist_spec')
+    def test_unchanged_description_skips_submit(self, mock_get_spec,
+                                                mock_subjects, mock_run):
+        """An update that would not change the description must not send
+        the spec back to the server."""
+        mock_get_spec.return_value = SAMPLE_SPEC_WITH_MARKER
+        mock_subjects.return_value = ['Add validation', 'Fix redirect']
+        update_changelist('12345', 'main', '/ws')
+        mock_run.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -9,122 +9,123 @@ from unittest import mock
 from git_p4son.common import CommandError, RunError
 from git_p4son.git import (
     LocalChanges,
-    find_common_ancestor,
     get_local_changes,
 )
 from git_p4son.lib import open_changes_for_edit
 from git_p4son.perforce import (
-    get_changelist_for_file,
+    get_changelists_for_files,
     include_changes_in_changelist,
 )
 from tests.helpers import make_run_result
 
 
-class TestGetChangelistForFile(unittest.TestCase):
-    @mock.patch('git_p4son.perforce.run')
-    def test_file_not_opened(self, mock_run):
-        mock_run.return_value = make_run_result(stdout=[])
-        result = get_changelist_for_file('foo.txt', '/ws')
-        self.assertIsNone(result)
+def _fstat_record(client_file, action, change):
+    return [f'... clientFile {client_file}', f'... action {action}',
+            f'... change {change}', '']
 
-    @mock.patch('git_p4son.perforce.run')
-    def test_file_in_default_changelist(self, mock_run):
-        mock_run.return_value = make_run_result(stdout=[
-            '... depotFile //depot/foo.txt',
-            '... action edit',
-            '... change default',
-            '... type text',
-        ])
-        result = get_changelist_for_file('foo.txt', '/ws')
-        self.assertEqual(result, ('default', 'edit'))
 
+class TestGetChangelistsForFiles(unittest.TestCase):
     @mock.patch('git_p4son.perforce.run')
-    def test_file_in_numbered_changelist(self, mock_run):
-        mock_run.return_value = make_run_result(stdout=[
-            '... depotFile //depot/foo.txt',
-            '... action edit',
-            '... change 12345',
-            '... type text',
-        ])
-        result = get_changelist_for_file('foo.txt', '/ws')
-        self.assertEqual(result, ('12345', 'edit'))
+    def test_single_fstat_call_for_all_files(self, mock_run):
+        mock_run.return_value = make_run_result(
+            stdout=(_fstat_record('/ws/a.txt', 'edit', '12345')
+                    + _fstat_record('/ws/sub/b.txt', 'add', 'default')),
+            stderr=['/ws/c.txt - file(s) not opened on this client.'])
+        result = get_changelists_for_files(
+            ['a.txt', 'sub/b.txt', 'c.txt'], '/ws')
+        mock_run.assert_called_once()
+        self.assertEqual(mock_run.call_args.args[0][:5],
+                         ['p4', '-x', '-', '-ztag', 'fstat'])
+        self.assertEqual(mock_run.call_args.kwargs['input'],
+                         'a.txt\nsub/b.txt\nc.txt\n')
+        self.assertEqual(result, {
+            'a.txt': ('12345', 'edit'),
+            'sub/b.txt': ('default', 'add'),
+        })
 
     @mock.patch('git_p4son.perforce.run')
-    def test_file_opened_for_add(self, mock_run):
-        mock_run.return_value = make_run_result(stdout=[
-            '... depotFile //depot/foo.txt',
-            '... action add',
-            '... change 12345',
-        ])
-        result = get_changelist_for_file('foo.txt', '/ws')
-        self.assertEqual(result, ('12345', 'add'))
+    def test_keys_follow_input_order(self, mock_run):
+        mock_run.return_value = make_run_result(
+            stdout=(_fstat_record('/ws/b.txt', 'edit', '1')
+                    + _fstat_record('/ws/a.txt', 'edit', '1')))
+        result = get_changelists_for_files(['a.txt', 'b.txt'], '/ws')
+        self.assertEqual(list(result), ['a.txt', 'b.txt'])
 
     @mock.patch('git_p4son.perforce.run')
-    def test_file_opened_for_delete(self, mock_run):
-        mock_run.return_value = make_run_result(stdout=[
-            '... depotFile //depot/foo.txt',
-            '... action delete',
-            '... change 12345',
-        ])
-        result = get_changelist_for_file('foo.txt', '/ws')
-        self.assertEqual(result, ('12345', 'delete'))
+    def test_action_variants(self, mock_run):
+        for action in ('edit', 'add', 'delete', 'move/add'):
+            with self.subTest(action=action):
+                mock_run.return_value = make_run_result(
+                    stdout=_fstat_record('/ws/foo.txt', action, 'default'))
+                result = get_changelists_for_files(['foo.txt'], '/ws')
+                self.assertEqual(result, {'foo.txt': ('default', action)})
 
     @mock.patch('git_p4son.perforce.run')
-    def test_file_opened_for_move_add(self, mock_run):
-        mock_run.return_value = make_run_result(stdout=[
-            '... depotFile //depot/foo.txt',
-            '... action move/add',
-            '... change 12345',
+    def test_not_opened_and_not_in_depot_are_omitted(self, mock_run):
+        mock_run.return_value = make_run_result(returncode=1, stderr=[
+            'new.txt - no such file(s).',
+            '/ws/foo.txt - file(s) not opened on this client.',
         ])
-        result = get_changelist_for_file('foo.txt', '/ws')
-        self.assertEqual(result, ('12345', 'move/add'))
+        result = get_changelists_for_files(['new.txt', 'foo.txt'], '/ws')
+        self.assertEqual(result, {})
 
     @mock.patch('git_p4son.perforce.run')
-    def test_add_in_default_changelist(self, mock_run):
-        mock_run.return_value = make_run_result(stdout=[
-            '... depotFile //depot/foo.txt',
-            '... action add',
-            '... change default',
-        ])
-        result = get_changelist_for_file('foo.txt', '/ws')
-        self.assertEqual(result, ('default', 'add'))
-
+    def test_file_outside_client_view_is_omitted(self, mock_run):
+        """The open step reports it; the lookup must not abort."""
+        mock_run.return_value = make_run_result(
+            stdout=_fstat_record('/ws/foo.txt', 'edit', '100'),
+            stderr=['/elsewhere/bar.txt - file(s) not in client view.'])
+        result = get_changelists_for_files(
+            ['foo.txt', '/elsewhere/bar.txt'], '/ws')
+        self.assertEqual(result, {'foo.txt': ('100', 'edit')})
 
-class TestFindCommonAncestor(unittest.TestCase):
-    @mock.patch('git_p4son.git.run')
-    def test_finds_ancestor(self, mock_run):
-        mock_run.return_value = make_run_result(stdout=['abc123def456'])
-        ancestor = find_common_ancestor('main', 'HEAD', '/ws')
-        self.assertEqual(ancestor, 'abc123def456')
+    @mock.patch('git_p4son.perforce.run')
+    def test_other_p4_errors_raise(self, mock_run):
+        """E.g. not logged in: must not look like 'nothing opened'."""
+        mock_run.return_value = make_run_result(returncode=1, stderr=[
+            'Perforce password (P4PASSWD) invalid or unset.'])
+        with self.assertRaises(RunError) as ctx:
+            get_changelists_for_files(['foo.txt'], '/ws')
+        self.assertEqual(ctx.exception.stderr, [
+            'Perforce password (P4PASSWD) invalid or unset.'])
 
-    @mock.patch('git_p4son.git.run')
-    def test_failure(self, mock_run):
-        mock_run.side_effect = RunError('merge-base failed')
+    @mock.patch('git_p4son.perforce.run')
+    def test_failure_without_message_raises(self, mock_run):
+        mock_run.return_value = make_run_result(returncode=1)
         with self.assertRaises(RunError):
-            find_common_ancestor('main', 'HEAD', '/ws')
+            get_changelists_for_files(['foo.txt'], '/ws')
+
+    def test_client_root_through_symlink(self):
+        """p4 reports the client root path; git the symlinked one."""
+        with tempfile.TemporaryDirectory() as tmp:
+            real_root = os.path.join(tmp, 'real')
+            os.mkdir(real_root)
+            link_root = os.path.join(tmp, 'link')
+            os.symlink(real_root, link_root)
+            with mock.patch('git_p4son.perforce.run') as mock_run:
+                mock_run.return_value = make_run_result(stdout=_fstat_record(
+                    os.path.join(real_root, 'foo.txt'), 'edit', '7'))
+                result = get_changelists_for_files(['foo.txt'], link_root)
+        self.assertEqual(result, {'foo.txt': ('7', 'edit')})
 
-    @mock.patch('git_p4son.git.run')
-    def test_no_output(self, mock_run):
-        mock_run.return_value = make_run_result(stdout=[])
-        with self.assertRaises(CommandError):
-            find_common_ancestor('main', 'HEAD', '/ws')
+    @mock.patch('git_p4son.perforce.run')
+    def test_no_files_skips_p4(self, mock_run):
+        self.assertEqual(get_changelists_for_files([], '/ws'), {})
+        mock_run.assert_not_called()
 
 
 class TestGetLocalGitChanges(unittest.TestCase):
     @mock.patch('git_p4son.git.run')
     def test_parses_all_change_types(self, mock_run):
-        mock_run.side_effect = [
-            # git merge-base
-            make_run_result(stdout=['abc123']),
-            # git diff --name-status
-            make_run_result(stdout=[
-                'M\tmodified.txt',
-                'A\tadded.txt',
-                'D\tdeleted.txt',
-                'R100\told_name.txt\tnew_name.txt',
-            ]),
-        ]
+        mock_run.return_value = make_run_result(stdout=(
+            b'M\0modified.txt\0'
+            b'A\0added.txt\0'
+            b'D\0deleted.txt\0'
+            b'R100\0old_name.txt\0new_name.txt\0'))
         changes = get_local_changes('main', '/ws')
+        # One git call: the three-dot range resolves the merge base.
+        mock_run.assert_called_once()
+        self.assertIn('main...HEAD', mock_run.call_args.args[0])
         self.assertEqual(changes.mods, ['modified.txt'])
         self.assertEqual(changes.adds, ['added.txt'])
         self.assertEqual(changes.dels, ['deleted.txt'])
@@ -133,10 +134,7 @@ class TestGetLocalGitChanges(unittest.TestCase):
     @mock.patch('git_p4son.git.run')
     def test_typechange_treated_as_modify(self, mock_run):
         """T (e.g. symlink to regular file) is a content change."""
-        mock_run.side_effect = [
-            make_run_result(stdout=['abc123']),
-            make_run_result(stdout=['T\tlink.txt']),
-        ]
+        mock_run.return_value = make_run_result(stdout=b'T\0link.txt\0')
         changes = get_local_changes('main', '/ws')
         self.assertEqual(changes.mods, ['link.txt'])
 
@@ -144,15 +142,29 @@ class TestGetLocalGitChanges(unittest.TestCase):
     def test_copy_treated_as_add_of_destination(self, mock_run):
         """C### (with diff.renames=copies) leaves the source untouched;
         only the destination is a new file."""
-        mock_run.side_effect = [
-            make_run_result(stdout=['abc123']),
-            make_run_result(stdout=['C100\tsrc.txt\tcopy.txt']),
-        ]
+        mock_run.return_value = make_run_result(
+            stdout=b'C100\0src.txt\0copy.txt\0')
         changes = get_local_changes('main', '/ws')
         self.assertEqual(changes.adds, ['copy.txt'])
         self.assertEqual(changes.mods, [])
         self.assertEqual(changes.dels, [])
 
+    @mock.patch('git_p4son.git.run')
+    def test_tab_and_newline_in_filename(self, mock_run):
+        """With -z, separators inside filenames are kept verbatim."""
+        mock_run.return_value = make_run_result(
+            stdout=b'A\0tab\there.txt\0M\0new\nline.txt\0')
+        changes = get_local_changes('main', '/ws')
+        self.assertEqual(changes.adds, ['tab\there.txt'])
+        self.assertEqual(changes.mods, ['new\nline.txt'])
+
+    @mock.patch('git_p4son.git.run')
+    def test_no_changes(self, mock_run):
+        mock_run.return_value = make_run_result(stdout=b'')
+        changes = get_local_changes('main', '/ws')
+        self.assertEqual((changes.adds, changes.mods, changes.dels,
+                          changes.moves), ([], [], [], []))
+
     @mock.patch('git_p4son.git.run')
     def test_merge_base_failure(self, mock_run):
         mock_run.side_effect = RunError('merge-base failed')
@@ -161,10 +173,7 @@ class TestGetLocalGitChanges(unittest.TestCase):
 
     @mock.patch('git_p4son.git.run')
     def test_unknown_status(self, mock_run):
-        mock_run.side_effect = [
-            make_run_result(stdout=['abc123']),
-            make_run_result(stdout=['X\tunknown.txt']),
-        ]
+        mock_run.return_value = make_run_result(stdout=b'X\0unknown.txt\0')
         with self.assertRaises(CommandError):
             get_local_changes('main', '/ws')
 
@@ -196,58 +205,105 @@ class TestGetLocalChangesNonAsciiPaths(unittest.TestCase):
 
 class TestOpenWarnings(unittest.TestCase):
     """p4 exits 0 for per-file problems and only prints the reason, so a
-    file that did not open must be surfaced as a warning."""
+    file that did not open must be surfaced as a warning. Opens run with
+    p4 -s, which tags each output line with its severity."""
 
     @mock.patch('git_p4son.perforce.log')
-    @mock.patch('git_p4son.perforce.get_changelist_for_file',
-                return_value=None)
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={})
     @mock.patch('git_p4son.perforce.run')
     def test_warns_when_p4_declines_to_open(self, mock_run, _check,
                                             mock_log):
-        mock_run.return_value = make_run_result(
-            stdout=["//depot/existing.txt - can't add existing file"])
+        mock_run.return_value = make_run_result(stdout=[
+            "warning: //depot/existing.txt - can't add existing file",
+            'exit: 0'])
         changes = LocalChanges()
         changes.adds = ['existing.txt']
         include_changes_in_changelist(changes, '100', '/ws')
-        mock_log.warning.assert_called_once()
+        mock_log.warning.assert_called_once_with(
+            'p4 add reported 1 problem(s):')
 
     @mock.patch('git_p4son.perforce.log')
-    @mock.patch('git_p4son.perforce.get_changelist_for_file',
-                return_value=None)
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={})
+    @mock.patch('git_p4son.perforce.run')
+    def test_counts_messages_not_files(self, mock_run, _check, mock_log):
+        """p4 can print several messages for a single file."""
+        mock_run.return_value = make_run_result(returncode=1, stdout=[
+            'warning: big.bin - file(s) not in client view.',
+            "error: big.bin - can't add file outside the workspace.",
+            'exit: 1'])
+        changes = LocalChanges()
+        changes.adds = ['big.bin']
+        include_changes_in_changelist(changes, '100', '/ws')
+        mock_log.warning.assert_called_once_with(
+            'p4 add reported 2 problem(s):')
+        self.assertEqual(mock_log.info.call_count, 2)
+
+    @mock.patch('git_p4son.perforce.log')
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={})
     @mock.patch('git_p4son.perforce.run')
     def test_p4_ignored_file_warns_and_continues(self, mock_run, _check,
                                                  mock_log):
         """p4 add exits non-zero for files matching .p4ignore; the file
         is skipped with a warning and the remaining files still open."""
-        mock_run.side_effect = [
-            make_run_result(
-                returncode=1,
-                stderr=["generated.cs - ignored file can't be added."]),
-            make_run_result(
-                stdout=['//depot/real.txt#1 - opened for add']),
-        ]
+        mock_run.return_value = make_run_result(returncode=1, stdout=[
+            'info: //depot/real.txt#1 - opened for add',
+            "error: generated.cs - ignored file can't be added.",
+            'exit: 1'])
         changes = LocalChanges()
         changes.adds = ['generated.cs', 'real.txt']
         include_changes_in_changelist(changes, '100', '/ws')
-        self.assertEqual(mock_run.call_count, 2)
-        mock_log.warning.assert_called_once()
+        mock_run.assert_called_once()
+        mock_log.warning.assert_called_once_with(
+            'p4 add reported 1 problem(s):')
+        mock_log.info.assert_called_once_with(
+            "  generated.cs - ignored file can't be added.")
 
     @mock.patch('git_p4son.perforce.log')
-    @mock.patch('git_p4son.perforce.get_changelist_for_file',
-                return_value=None)
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={})
     @mock.patch('git_p4son.perforce.run')
     def test_no_warning_when_opened(self, mock_run, _check, mock_log):
-        mock_run.return_value = make_run_result(
-            stdout=['//depot/new.txt#1 - opened for add'])
+        mock_run.return_value = make_run_result(stdout=[
+            'info: //depot/new.txt#1 - opened for add', 'exit: 0'])
         changes = LocalChanges()
         changes.adds = ['new.txt']
         include_changes_in_changelist(changes, '100', '/ws')
         mock_log.warning.assert_not_called()
 
+    @mock.patch('git_p4son.perforce.log')
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={})
+    @mock.patch('git_p4son.perforce.run')
+    def test_info_wording_does_not_matter(self, mock_run, _check, mock_log):
+        """Success is not judged by the text of p4's info lines."""
+        mock_run.return_value = make_run_result(stdout=[
+            'info: //depot/mod.txt#3 - currently opened for edit',
+            'exit: 0'])
+        changes = LocalChanges()
+        changes.mods = ['mod.txt']
+        include_changes_in_changelist(changes, '100', '/ws')
+        mock_log.warning.assert_not_called()
+
+    @mock.patch('git_p4son.perforce.log')
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={})
+    @mock.patch('git_p4son.perforce.run')
+    def test_warns_on_failure_without_file_errors(self, mock_run, _check,
+                                                  mock_log):
+        mock_run.return_value = make_run_result(returncode=1)
+        changes = LocalChanges()
+        changes.adds = ['new.txt']
+        include_changes_in_changelist(changes, '100', '/ws')
+        mock_log.warning.assert_called_once_with(
+            'p4 add exited with code 1')
+
 
 class TestIncludeChangesInChangelist(unittest.TestCase):
     # --- added files ---
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=None)
+    @mock.patch('git_p4son.perforce.get_changelists_for_files', return_value={})
     @mock.patch('git_p4son.perforce.run')
     def test_adds_files(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -255,11 +311,13 @@ class TestIncludeChangesInChangelist(unittest.TestCase):
         changes.adds = ['new_file.txt']
         include_changes_in_changelist(changes, '100', '/ws')
         mock_run.assert_called_with(
-            ['p4', 'add', '-c', '100', 'new_file.txt'],
-            cwd='/ws', dry_run=False, fail_on_returncode=False,
+            ['p4', '-s', '-x', '-', 'add', '-c', '100'],
+            cwd='/ws', dry_run=False, input='new_file.txt\n',
+            fail_on_returncode=False,
         )
 
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=('200', 'add'))
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={'new_file.txt': ('200', 'add')})
     @mock.patch('git_p4son.perforce.run')
     def test_reopens_added_file_in_different_changelist(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -267,11 +325,13 @@ class TestIncludeChangesInChangelist(unittest.TestCase):
         changes.adds = ['new_file.txt']
         include_changes_in_changelist(changes, '100', '/ws')
         mock_run.assert_called_with(
-            ['p4', 'reopen', '-c', '100', 'new_file.txt'],
-            cwd='/ws', dry_run=False,
+            ['p4', '-x', '-', 'reopen', '-c', '100'],
+            cwd='/ws', dry_run=False, input='new_file.txt\n',
+            fail_on_returncode=True,
         )
 
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=('100', 'add'))
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={'new_file.txt': ('100', 'add')})
     @mock.patch('git_p4son.perforce.run')
     def test_skips_added_file_already_in_correct_changelist(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -281,7 +341,7 @@ class TestIncludeChangesInChangelist(unittest.TestCase):
         mock_run.assert_not_called()
 
     # --- modified files ---
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=None)
+    @mock.patch('git_p4son.perforce.get_changelists_for_files', return_value={})
     @mock.patch('git_p4son.perforce.run')
     def test_edits_unchecked_out_file(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -289,11 +349,13 @@ class TestIncludeChangesInChangelist(unittest.TestCase):
         changes.mods = ['mod.txt']
         include_changes_in_changelist(changes, '100', '/ws')
         mock_run.assert_called_with(
-            ['p4', 'edit', '-c', '100', 'mod.txt'],
-            cwd='/ws', dry_run=False, fail_on_returncode=False,
+            ['p4', '-s', '-x', '-', 'edit', '-c', '100'],
+            cwd='/ws', dry_run=False, input='mod.txt\n',
+            fail_on_returncode=False,
         )
 
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=('200', 'edit'))
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={'mod.txt': ('200', 'edit')})
     @mock.patch('git_p4son.perforce.run')
     def test_reopens_file_in_different_changelist(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -301,11 +363,13 @@ class TestIncludeChangesInChangelist(unittest.TestCase):
         changes.mods = ['mod.txt']
         include_changes_in_changelist(changes, '100', '/ws')
         mock_run.assert_called_with(
-            ['p4', 'reopen', '-c', '100', 'mod.txt'],
-            cwd='/ws', dry_run=False,
+            ['p4', '-x', '-', 'reopen', '-c', '100'],
+            cwd='/ws', dry_run=False, input='mod.txt\n',
+            fail_on_returncode=True,
         )
 
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=('100', 'edit'))
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={'mod.txt': ('100', 'edit')})
     @mock.patch('git_p4son.perforce.run')
     def test_skips_file_already_in_correct_changelist(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -315,7 +379,7 @@ class TestIncludeChangesInChangelist(unittest.TestCase):
         mock_run.assert_not_called()
 
     # --- deleted files ---
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=None)
+    @mock.patch('git_p4son.perforce.get_changelists_for_files', return_value={})
     @mock.patch('git_p4son.perforce.run')
     def test_deletes_files(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -323,11 +387,13 @@ class TestIncludeChangesInChangelist(unittest.TestCase):
         changes.dels = ['old.txt']
         include_changes_in_changelist(changes, '100', '/ws')
         mock_run.assert_called_with(
-            ['p4', 'delete', '-c', '100', 'old.txt'],
-            cwd='/ws', dry_run=False, fail_on_returncode=False,
+            ['p4', '-s', '-x', '-', 'delete', '-c', '100'],
+            cwd='/ws', dry_run=False, input='old.txt\n',
+            fail_on_returncode=False,
         )
 
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=('200', 'delete'))
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={'old.txt': ('200', 'delete')})
     @mock.patch('git_p4son.perforce.run')
     def test_reopens_deleted_file_in_different_changelist(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -335,11 +401,13 @@ class TestIncludeChangesInChangelist(unittest.TestCase):
         changes.dels = ['old.txt']
         include_changes_in_changelist(changes, '100', '/ws')
         mock_run.assert_called_with(
-            ['p4', 'reopen', '-c', '100', 'old.txt'],
-            cwd='/ws', dry_run=False,
+            ['p4', '-x', '-', 'reopen', '-c', '100'],
+            cwd='/ws', dry_run=False, input='old.txt\n',
+            fail_on_returncode=True,
         )
 
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=('100', 'delete'))
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={'old.txt': ('100', 'delete')})
     @mock.patch('git_p4son.perforce.run')
     def test_skips_deleted_file_already_in_correct_changelist(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -349,7 +417,7 @@ class TestIncludeChangesInChangelist(unittest.TestCase):
         mock_run.assert_not_called()
 
     # --- moved files ---
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=None)
+    @mock.patch('git_p4son.perforce.get_changelists_for_files', return_value={})
     @mock.patch('git_p4son.perforce.run')
     def test_moves_files(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -358,27 +426,48 @@ class TestIncludeChangesInChangelist(unittest.TestCase):
         include_changes_in_changelist(changes, '100', '/ws')
         calls = mock_run.call_args_list
         self.assertEqual(len(calls), 2)
-        self.assertEqual(calls[0][0][0], [
-                         'p4', 'delete', '-c', '100', 'old.txt'])
-        self.assertEqual(calls[1][0][0], ['p4', 'add', '-c', '100', 'new.txt'])
+        self.assertEqual(calls[0][0][0],
+                         ['p4', '-s', '-x', '-', 'add', '-c', '100'])
+        self.assertEqual(calls[0][1]['input'], 'new.txt\n')
+        self.assertEqual(calls[1][0][0],
+                         ['p4', '-s', '-x', '-', 'delete', '-c', '100'])
+        self.assertEqual(calls[1][1]['input'], 'old.txt\n')
 
-    @mock.patch('git_p4son.perforce.get_changelist_for_file',
-                side_effect=[('200', 'delete'), ('200', 'add')])
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={'old.txt': ('200', 'delete'),
+                              'new.txt': ('200', 'add')})
     @mock.patch('git_p4son.perforce.run')
     def test_reopens_moved_files_in_different_changelist(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
         changes = LocalChanges()
         changes.moves = [('old.txt', 'new.txt')]
         include_changes_in_changelist(changes, '100', '/ws')
+        mock_run.assert_called_once_with(
+            ['p4', '-x', '-', 'reopen', '-c', '100'],
+            cwd='/ws', dry_run=False, input='old.txt\nnew.txt\n',
+            fail_on_returncode=True,
+        )
+
+    # --- batching ---
+    @mock.patch('git_p4son.perforce.get_changelists_for_files', return_value={})
+    @mock.patch('git_p4son.perforce.run')
+    def test_batches_files_per_action(self, mock_run, mock_check):
+        mock_run.return_value = make_run_result()
+        changes = LocalChanges()
+        changes.adds = ['a.txt', 'b.txt']
+        changes.mods = ['c.txt', 'd.txt']
+        include_changes_in_changelist(changes, '100', '/ws')
         calls = mock_run.call_args_list
         self.assertEqual(len(calls), 2)
-        self.assertEqual(calls[0][0][0], [
-                         'p4', 'reopen', '-c', '100', 'old.txt'])
-        self.assertEqual(calls[1][0][0], [
-                         'p4', 'reopen', '-c', '100', 'new.txt'])
+        self.assertEqual(calls[0][0][0],
+                         ['p4', '-s', '-x', '-', 'add', '-c', '100'])
+        self.assertEqual(calls[0][1]['input'], 'a.txt\nb.txt\n')
+        self.assertEqual(calls[1][0][0],
+                         ['p4', '-s', '-x', '-', 'edit', '-c', '100'])
+        self.assertEqual(calls[1][1]['input'], 'c.txt\nd.txt\n')
 
     # --- dry run ---
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=None)
+    @mock.patch('git_p4son.perforce.get_changelists_for_files', return_value={})
     @mock.patch('git_p4son.perforce.run')
     def test_dry_run(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -386,8 +475,9 @@ class TestIncludeChangesInChangelist(unittest.TestCase):
         changes.adds = ['new.txt']
         include_changes_in_changelist(changes, '100', '/ws', dry_run=True)
         mock_run.assert_called_with(
-            ['p4', 'add', '-c', '100', 'new.txt'],
-            cwd='/ws', dry_run=True, fail_on_returncode=False,
+            ['p4', '-s', '-x', '-', 'add', '-c', '100'],
+            cwd='/ws', dry_run=True, input='new.txt\n',
+            fail_on_returncode=False,
         )
 
 
@@ -395,7 +485,8 @@ class TestActionMismatch(unittest.TestCase):
     """Tests for reopening files when the p4 action doesn't match the desired action."""
 
     # --- edit -> delete ---
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=('100', 'edit'))
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={'file.txt': ('100', 'edit')})
     @mock.patch('git_p4son.perforce.run')
     def test_edit_to_delete_same_cl(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -404,11 +495,12 @@ class TestActionMismatch(unittest.TestCase):
         include_changes_in_changelist(changes, '100', '/ws')
         calls = mock_run.call_args_list
         self.assertEqual(len(calls), 2)
-        self.assertEqual(calls[0][0][0], ['p4', 'revert', 'file.txt'])
+        self.assertEqual(calls[0][0][0], ['p4', '-x', '-', 'revert'])
         self.assertEqual(calls[1][0][0],
-                         ['p4', 'delete', '-c', '100', 'file.txt'])
+                         ['p4', '-s', '-x', '-', 'delete', '-c', '100'])
 
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=('200', 'edit'))
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={'file.txt': ('200', 'edit')})
     @mock.patch('git_p4son.perforce.run')
     def test_edit_to_delete_different_cl(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -417,12 +509,13 @@ class TestActionMismatch(unittest.TestCase):
         include_changes_in_changelist(changes, '100', '/ws')
         calls = mock_run.call_args_list
         self.assertEqual(len(calls), 2)
-        self.assertEqual(calls[0][0][0], ['p4', 'revert', 'file.txt'])
+        self.assertEqual(calls[0][0][0], ['p4', '-x', '-', 'revert'])
         self.assertEqual(calls[1][0][0],
-                         ['p4', 'delete', '-c', '100', 'file.txt'])
+                         ['p4', '-s', '-x', '-', 'delete', '-c', '100'])
 
     # --- delete -> edit ---
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=('100', 'delete'))
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={'file.txt': ('100', 'delete')})
     @mock.patch('git_p4son.perforce.run')
     def test_delete_to_edit_same_cl(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -431,13 +524,17 @@ class TestActionMismatch(unittest.TestCase):
         include_changes_in_changelist(changes, '100', '/ws')
         calls = mock_run.call_args_list
         self.assertEqual(len(calls), 3)
-        self.assertEqual(calls[0][0][0], ['p4', 'revert', 'file.txt'])
+        self.assertEqual(calls[0][0][0], ['p4', '-x', '-', 'revert'])
         self.assertEqual(calls[1][0][0],
-                         ['p4', 'edit', '-c', '100', 'file.txt'])
+                         ['p4', '-s', '-x', '-', 'edit', '-c', '100'])
         self.assertEqual(calls[2][0][0],
-                         ['git', 'restore', 'file.txt'])
+                         ['git', 'restore', '--pathspec-from-file=-',
+                          '--pathspec-file-nul'])
+        # NUL-separated, so git takes the name verbatim
+        self.assertEqual(calls[2][1]['input'], 'file.txt\0')
 
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=('200', 'delete'))
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={'file.txt': ('200', 'delete')})
     @mock.patch('git_p4son.perforce.run')
     def test_delete_to_edit_different_cl(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -446,14 +543,16 @@ class TestActionMismatch(unittest.TestCase):
         include_changes_in_changelist(changes, '100', '/ws')
         calls = mock_run.call_args_list
         self.assertEqual(len(calls), 3)
-        self.assertEqual(calls[0][0][0], ['p4', 'revert', 'file.txt'])
+        self.assertEqual(calls[0][0][0], ['p4', '-x', '-', 'revert'])
         self.assertEqual(calls[1][0][0],
-                         ['p4', 'edit', '-c', '100', 'file.txt'])
+                         ['p4', '-s', '-x', '-', 'edit', '-c', '100'])
         self.assertEqual(calls[2][0][0],
-                         ['git', 'restore', 'file.txt'])
+                         ['git', 'restore', '--pathspec-from-file=-',
+                          '--pathspec-file-nul'])
 
     # --- add -> edit (keep as add, file is new to depot) ---
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=('100', 'add'))
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={'file.txt': ('100', 'add')})
     @mock.patch('git_p4son.perforce.run')
     def test_add_to_edit_same_cl_keeps_add(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -462,7 +561,8 @@ class TestActionMismatch(unittest.TestCase):
         include_changes_in_changelist(changes, '100', '/ws')
         mock_run.assert_not_called()
 
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=('200', 'add'))
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={'file.txt': ('200', 'add')})
     @mock.patch('git_p4son.perforce.run')
     def test_add_to_edit_different_cl_reopens(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -470,12 +570,14 @@ class TestActionMismatch(unittest.TestCase):
         changes.mods = ['file.txt']
         include_changes_in_changelist(changes, '100', '/ws')
         mock_run.assert_called_once_with(
-            ['p4', 'reopen', '-c', '100', 'file.txt'],
-            cwd='/ws', dry_run=False,
+            ['p4', '-x', '-', 'reopen', '-c', '100'],
+            cwd='/ws', dry_run=False, input='file.txt\n',
+            fail_on_returncode=True,
         )
 
     # --- add -> delete (revert only, no reopen) ---
-    @mock.patch('git_p4son.perforce.get_changelist_for_file', return_value=('100', 'add'))
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={'file.txt': ('100', 'add')})
     @mock.patch('git_p4son.perforce.run')
     def test_add_to_delete_reverts_only(self, mock_run, mock_check):
         mock_run.return_value = make_run_result()
@@ -484,7 +586,7 @@ class TestActionMismatch(unittest.TestCase):
         include_changes_in_changelist(changes, '100', '/ws')
         calls = mock_run.call_args_list
         self.assertEqual(len(calls), 1)
-        self.assertEqual(calls[0][0][0], ['p4', 'revert', 'file.txt'])
+        self.assertEqual(calls[0][0][0], ['p4', '-x', '-', 'revert'])
 
 
 class TestOpenChangesForEdit(unittest.TestCase):
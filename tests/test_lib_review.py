@@ -92,6 +92,24 @@ class TestP4AddReviewKeywordToChangelist(unittest.TestCase):
         spec_input = call_kwargs.kwargs.get('input')
         self.assertIn('#review', spec_input)
 
+    @mock.patch('git_p4son.perforce.run')
+    def test_review_keyword_appended_to_description(self, mock_run):
+        mock_run.side_effect = [
+            make_run_result(stdout=SPEC_LINES_WITHOUT_REVIEW.copy()),
+            make_run_result(),
+        ]
+        add_review_keyword_to_changelist('100', '/ws')
+        spec_input = mock_run.call_args_list[1].kwargs['input']
+        self.assertIn(
+            'Description:\n\tMy description\n\t\n\t#review\n\nFiles:\n',
+            spec_input)
+
+    @mock.patch('git_p4son.perforce.run')
+    def test_missing_description_raises(self, mock_run):
+        mock_run.return_value = make_run_result(stdout=['Change:\t100'])
+        with self.assertRaises(CommandError):
+            add_review_keyword_to_changelist('100', '/ws')
+
     @mock.patch('git_p4son.perforce.run')
     def test_already_has_review_keyword(self, mock_run):
         mock_run.return_value = make_run_result(
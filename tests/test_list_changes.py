@@ -17,13 +17,13 @@ class TestGetCommitSubjectsSince(unittest.TestCase):
     @mock.patch('git_p4son.git.run')
     def test_extracts_subjects(self, mock_run):
         mock_run.return_value = make_run_result(stdout=[
-            'abc1234 First commit',
-            'def5678 Second commit',
+            'First commit',
+            'Second commit',
         ])
         subjects = get_commit_subjects_since('HEAD~1', '/workspace')
         self.assertEqual(subjects, ['First commit', 'Second commit'])
         mock_run.assert_called_once_with(
-            ['git', 'log', '--format=%h %s', '--no-decorate',
+            ['git', 'log', '--format=%s', '--no-decorate',
              '--reverse', '--no-merges', 'HEAD~1..HEAD'],
             cwd='/workspace',
         )
@@ -41,10 +41,12 @@ class TestGetCommitSubjectsSince(unittest.TestCase):
             get_commit_subjects_since('main', '/workspace')
 
     @mock.patch('git_p4son.git.run')
-    def test_hash_only_line_fallback(self, mock_run):
-        mock_run.return_value = make_run_result(stdout=['abc1234'])
+    def test_subject_with_leading_word_kept_whole(self, mock_run):
+        """No hash prefix to strip, so the subject is returned verbatim."""
+        mock_run.return_value = make_run_result(
+            stdout=['abc1234 looks like a hash'])
         subjects = get_commit_subjects_since('main', '/workspace')
-        self.assertEqual(subjects, ['abc1234'])
+        self.assertEqual(subjects, ['abc1234 looks like a hash'])
 
 
 class TestGetEnumeratedCommitLinesSince(unittest.TestCase):
@@ -22,8 +22,8 @@ class TestNewCommandDryRun(unittest.TestCase):
     carry dry_run=True, and the placeholder changelist must survive
     command-line rendering (a None changelist used to crash there)."""
 
-    @mock.patch('git_p4son.perforce.get_changelist_for_file',
-                return_value=None)
+    @mock.patch('git_p4son.perforce.get_changelists_for_files',
+                return_value={})
     @mock.patch('git_p4son.lib.get_local_changes')
     @mock.patch('git_p4son.lib.get_enumerated_commit_lines_since',
                 return_value=['1. Commit'])
@@ -124,6 +124,9 @@ class TestReviewCommand(unittest.TestCase):
             call_args[1]['env']['GIT_SEQUENCE_EDITOR'],
             'git-p4son _sequence-editor',
         )
+        # The resolved editor is handed on to the sequence editor
+        self.assertEqual(call_args[1]['env']['GIT_P4SON_EDITOR'],
+                         mock_resolve_editor.return_value)
 
     def test_multiline_message_rejected(self):
         """The rebase todo is line-based; an embedded newline in the
@@ -260,7 +263,7 @@ class TestSequenceEditorCommand(unittest.TestCase):
     def test_missing_todo_file(self):
         args = mock.Mock(filename='/tmp/git-rebase-todo',
                          workspace_dir='/workspace')
-        with mock.patch('os.path.exists', return_value=False):
+        with mock.patch('builtins.open', side_effect=FileNotFoundError):
             rc = sequence_editor_command(args)
         self.assertEqual(rc, 1)
 
@@ -317,6 +320,22 @@ class TestSequenceEditorCommand(unittest.TestCase):
         # Non-comment lines from git's original are NOT included
         self.assertNotIn("pick abc1234 First commit", full_output)
 
+    @mock.patch('git_p4son.review.subprocess.run')
+    def test_uses_editor_from_review_command(self, mock_subprocess_run):
+        """The editor passed down by review_command skips git var."""
+        mock_subprocess_run.return_value = mock.Mock(returncode=0)
+        args = mock.Mock(filename='/tmp/git-rebase-todo',
+                         workspace_dir='/workspace')
+        with mock.patch.dict('os.environ', {'GIT_P4SON_EDITOR': 'nano'}):
+            with mock.patch('builtins.open',
+                            mock.mock_open(read_data='pick abc First\n')):
+                rc = sequence_editor_command(args)
+
+        self.assertEqual(rc, 0)
+        mock_subprocess_run.assert_called_once()
+        self.assertEqual(mock_subprocess_run.call_args[0][0],
+                         ['nano', '/tmp/git-rebase-todo'])
+
     @mock.patch('git_p4son.review.subprocess.run')
     def test_editor_with_args(self, mock_subprocess_run):
         """Editor commands like 'code --wait' should be split properly."""
@@ -112,12 +112,30 @@ class TestParseP4SyncLine(unittest.TestCase):
         self.assertEqual(mode, 'del')
         self.assertEqual(filename, '/ws/foo.txt')
 
+    def test_deleted_file_at_revision_none(self):
+        mode, filename = parse_p4_sync_line(
+            '//depot/foo.txt#none - deleted as /ws/foo.txt')
+        self.assertEqual(mode, 'del')
+        self.assertEqual(filename, '/ws/foo.txt')
+
     def test_updated_file(self):
         mode, filename = parse_p4_sync_line(
             '//depot/foo.txt#3 - updating /ws/foo.txt')
         self.assertEqual(mode, 'upd')
         self.assertEqual(filename, '/ws/foo.txt')
 
+    def test_separator_inside_depot_path(self):
+        mode, filename = parse_p4_sync_line(
+            '//depot/a - updating b/foo.txt#1 - added as /ws/a - b/foo.txt')
+        self.assertEqual(mode, 'add')
+        self.assertEqual(filename, '/ws/a - b/foo.txt')
+
+    def test_marker_inside_local_path(self):
+        mode, filename = parse_p4_sync_line(
+            '//depot/foo.txt#1 - added as /ws/x - deleted as y/foo.txt')
+        self.assertEqual(mode, 'add')
+        self.assertEqual(filename, '/ws/x - deleted as y/foo.txt')
+
     def test_clobber_file(self):
         mode, filename = parse_p4_sync_line(
             "Can't clobber writable file /ws/foo.txt")